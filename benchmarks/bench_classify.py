@@ -0,0 +1,75 @@
+import sys; sys.path.append('.');
+import random
+import time
+
+from iinput import utils
+
+
+def legacy_interpret_type(s):
+    s = s.strip()
+    if s.lower() in ["true", "false"]:
+        return bool
+    elif utils.isint(s):
+        return int
+    elif utils.isfloat(s):
+        return float
+    elif s == "None":
+        return None
+    elif s:
+        return str
+    else:
+        return None
+
+
+def legacy_auto_cast(items, allowed_types):
+    for i in range(len(items)):
+        items[i] = items[i].strip()
+        item_type = legacy_interpret_type(items[i])
+        if item_type not in allowed_types:
+            if items[i] in ['0', '1'] and bool in allowed_types:
+                items[i] = items[i] == '1'
+            elif items[i] and str in allowed_types:
+                items[i] = str(items[i])
+            else:
+                items[i] = None
+        elif item_type == bool:
+            items[i] = items[i].lower() == "true"
+        else:
+            items[i] = item_type(items[i])
+    return items
+
+
+def corpus(n, numeric=False, seed=0):
+    rng = random.Random(seed)
+    makers = [
+        lambda: str(rng.randint(-10 ** 6, 10 ** 6)),
+        lambda: f"{rng.uniform(-1e3, 1e3):.4f}",
+    ]
+    if not numeric:
+        makers += [
+            lambda: rng.choice(['true', 'False']),
+            lambda: f"host{rng.randint(0, 999)}",
+        ]
+    return [rng.choice(makers)() for _ in range(n)]
+
+
+def bench(cast, items, allowed_types, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        batch = list(items)
+        start = time.perf_counter()
+        cast(batch, allowed_types)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for numeric in [False, True]:
+        items = corpus(n, numeric=numeric)
+        for allowed_types in [[str, int, float, bool], [int, float], [str]]:
+            legacy = bench(legacy_auto_cast, items, allowed_types)
+            current = bench(utils.auto_cast, items, allowed_types)
+            names = ','.join(t.__name__ for t in allowed_types)
+            label = 'numeric' if numeric else 'mixed'
+            print(f"{label} [{names}] legacy: {legacy:,.0f} items/s  classify: {current:,.0f} items/s  ({current / legacy:.2f}x)")
@@ -0,0 +1,198 @@
+import sys; sys.path.append('.');
+import argparse
+import json
+import os
+import pty
+import select
+import statistics
+import termios
+import time
+import traceback
+
+from iinput import iinput, Menu
+
+
+MENU = Menu({i: f"host-{i:04d}.example.com" for i in range(1000)})
+
+# name: (args, kwargs, keystrokes, terminal mode the method reads in)
+METHODS = {
+    'yn': (('deploy?',), {}, b'y\n', None),
+    'value': (('value', [int]), {}, b'42\n', None),
+    'values': (('values',), {'allowed_types': [int]}, b'1, 2, 3\n', None),
+    'match_value': (('confirm', 'yes'), {'max_attempts': 3}, b'yes\n', None),
+    'match_values': (('targets', ['a', 'b']), {}, b'b, a\n', None),
+    'boolean': (('boolean',), {}, b'true\n', None),
+    'number': (('number',), {}, b'3.5\n', None),
+    'integer': (('integer',), {}, b'7\n', None),
+    'floating_point': (('float',), {}, b'2.5\n', None),
+    'character': (('character',), {}, b'x\n', None),
+    'string': (('string',), {}, b'hello\n', None),
+    'alpha': (('alpha',), {}, b'abc\n', None),
+    'alphanumeric': (('alphanumeric',), {}, b'abc1\n', None),
+    'line': (('line',), {}, b'a whole line\n', None),
+    'lines': (('lines',), {}, b'a\nb\n\x04', None),
+    'selection': ((MENU,), {}, b'999\n', None),
+    'multiselection': ((MENU,), {}, b'1-500, !13\n', None),
+    'email': (('email',), {}, b'ops@example.com\n', None),
+    'password': (('password',), {}, b'hunter2\n', 'noecho'),
+    'match_password': (('password', 'hunter2'), {'max_attempts': 3}, b'hunter2\n', 'noecho'),
+    'regex': (('id', r'^\d+$'), {}, b'123\n', None),
+    'wait_for_key_press': (('q',), {}, b'q', 'cbreak'),
+    'wait_for_some_key_press': ((['a', 'b'],), {}, b'b', 'cbreak'),
+    'wait_for_any_key_press': ((), {}, b'k', 'cbreak'),
+    'wait_for_enter': ((), {}, b'\n', None),
+}
+
+
+def io_counters():
+    with open('/proc/self/io', 'rb') as f:
+        fields = dict(line.split(b': ') for line in f.read().splitlines())
+    return int(fields[b'syscr']), int(fields[b'syscw'])
+
+
+def child(name, iterations, side):
+    args, kwargs, _, _ = METHODS[name]
+    method = getattr(iinput, name)
+    first, second = io_counters(), io_counters()
+    overhead = (second[0] - first[0], second[1] - first[1])
+    for _ in range(iterations):
+        before = io_counters()
+        os.write(side, b'R')
+        method(*args, **kwargs)
+        after = io_counters()
+        reads = after[0] - before[0] - overhead[0]
+        writes = after[1] - before[1] - overhead[1] - 1
+        os.write(side, f"{reads} {writes}\n".encode())
+
+
+def _mode_ready(master, mode):
+    lflag = termios.tcgetattr(master)[3]
+    if mode == 'noecho':
+        return not lflag & termios.ECHO
+    elif mode == 'cbreak':
+        return not lflag & termios.ICANON
+    return bool(lflag & termios.ICANON)
+
+
+class Harness:
+
+
+    def __init__(self, master, side):
+        self.master = master
+        self.side = side
+        self.buffer = b''
+        self.shown_at = 0.0
+        self.received_at = 0.0
+
+
+    def pump(self, timeout):
+        ready = select.select([self.master, self.side], [], [], timeout)[0]
+        now = time.perf_counter()
+        if self.master in ready:
+            try:
+                os.read(self.master, 1 << 16)
+                self.shown_at = now
+            except OSError:
+                pass
+        if self.side in ready:
+            data = os.read(self.side, 1 << 16)
+            if not data:
+                raise EOFError("the prompt process exited")
+            self.buffer += data
+            self.received_at = now
+        return bool(ready)
+
+
+    def expect(self, marker, timeout=10.0):
+        end = time.monotonic() + timeout
+        while marker not in self.buffer:
+            if time.monotonic() > end:
+                raise TimeoutError(f"no {marker!r} from the prompt process")
+            self.pump(0.05)
+        head, _, self.buffer = self.buffer.partition(marker)
+        return head
+
+
+    def settle(self, mode, quiet=0.002, timeout=10.0):
+        since = self.received_at
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            if not self.pump(quiet) and self.shown_at >= since and _mode_ready(self.master, mode):
+                return self.shown_at - since
+        raise TimeoutError("the prompt never became ready")
+
+
+def run(name, iterations):
+    side_read, side_write = os.pipe()
+    errors = os.dup(2)
+    pid, master = pty.fork()
+    if pid == 0:
+        os.close(side_read)
+        try:
+            child(name, iterations, side_write)
+        except BaseException:
+            os.write(errors, traceback.format_exc().encode())
+        finally:
+            os._exit(0)
+    os.close(side_write)
+    os.close(errors)
+    keys, mode = METHODS[name][2], METHODS[name][3]
+    harness = Harness(master, side_read)
+    prompts, responses, syscalls = [], [], []
+    try:
+        for _ in range(iterations):
+            harness.expect(b'R')
+            prompts.append(harness.settle(mode))
+            start = time.perf_counter()
+            os.write(master, keys)
+            counts = harness.expect(b'\n')
+            responses.append(time.perf_counter() - start)
+            syscalls.append(tuple(map(int, counts.split())))
+    finally:
+        os.close(side_read)
+        os.close(master)
+        os.waitpid(pid, 0)
+    return {
+        'prompt_ms': statistics.median(prompts) * 1000,
+        'response_ms': statistics.median(responses) * 1000,
+        'response_p95_ms': sorted(responses)[int(0.95 * (len(responses) - 1))] * 1000,
+        'syscr': statistics.median(r for r, _ in syscalls),
+        'syscw': statistics.median(w for _, w in syscalls),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="keystroke-to-return latency of every iinput method under a pseudo-terminal")
+    parser.add_argument('-k', '--filter', default='', help="only run methods whose name contains this")
+    parser.add_argument('-n', '--iterations', type=int, default=20)
+    parser.add_argument('--max-response-ms', type=float, default=float(os.environ.get('IINPUT_PTY_MAX_RESPONSE_MS', 50)),
+                        help="fail when the median keystroke-to-return latency exceeds this")
+    parser.add_argument('--max-syscalls', type=float, default=None, help="fail when a prompt makes more read+write syscalls")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args(argv)
+    if not sys.platform.startswith('linux'):
+        parser.error("the pty harness needs Linux (/proc/self/io)")
+
+    results, failures = {}, []
+    for name in METHODS:
+        if args.filter not in name:
+            continue
+        result = results[name] = run(name, args.iterations)
+        slow = result['response_ms'] > args.max_response_ms
+        noisy = args.max_syscalls is not None and result['syscr'] + result['syscw'] > args.max_syscalls
+        if slow or noisy:
+            failures.append(name)
+        print(f"{name:24} prompt {result['prompt_ms']:8.3f} ms  response {result['response_ms']:8.3f} ms "
+              f"(p95 {result['response_p95_ms']:8.3f})  syscr {result['syscr']:5.0f}  syscw {result['syscw']:5.0f}"
+              f"{'  FAIL' if slow or noisy else ''}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if failures:
+        print(f"{len(failures)} method(s) over budget: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
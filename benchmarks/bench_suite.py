@@ -0,0 +1,198 @@
+import sys; sys.path.append('.');
+import argparse
+import contextlib
+import gc
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from decimal import Decimal
+from ipaddress import IPv4Address
+
+from iinput import iinput, utils, validators, Form, Field, Menu, InputSource, ReplaySource, Table
+from iinput.converters import HexInt
+from iinput.iinput import format_prompt
+
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+
+class CycleSource(InputSource):
+
+
+    def __init__(self, answers):
+        self.answers = itertools.cycle(answers)
+
+
+    def readline(self, prompt='', timeout=None):
+        return next(self.answers)
+
+
+def short_answers(n, seed=0):
+    rng = random.Random(seed)
+    makers = [
+        lambda: str(rng.randint(-10 ** 6, 10 ** 6)),
+        lambda: f"{rng.uniform(-1e3, 1e3):.4f}",
+        lambda: rng.choice(['true', 'False', 'y', 'n']),
+        lambda: f" host{rng.randint(0, 999)} ",
+        lambda: f"user{rng.randint(0, 999)}@example.com",
+    ]
+    return [rng.choice(makers)() for _ in range(n)]
+
+
+def delimited_line(n, seed=0):
+    rng = random.Random(seed)
+    return ', '.join(str(rng.randint(0, 10 ** 6)) for _ in range(n))
+
+
+def prompt_loop(method, answers, *args, **kwargs):
+    source = CycleSource(answers)
+
+    def run():
+        with iinput.using(source):
+            return method(*args, **kwargs)
+    return run
+
+
+def cases(scale):
+    size = lambda n: max(1, int(n * scale))
+    answers = short_answers(size(1000))
+    line = delimited_line(size(1_000_000))
+    menu = Menu({i: f"host-{i:06d}.example.com" for i in range(size(100_000))})
+    last = str(len(menu) - 1)
+    retries = ['nope'] * size(1000) + ['42']
+    form = Form({'host': 'alphanumeric', 'port': Field(int, min=1, max=65535), 'admin': 'email',
+                 'ratio': float, 'enabled': bool, 'role': Field('string', choices=['admin', 'user'])})
+    record = {'host': 'db1', 'port': '5432', 'admin': 'ops@example.com', 'ratio': '0.5', 'enabled': 'true', 'role': 'user'}
+    replay = {f"field {i}": i for i in range(size(10_000))}
+    rows = [f"host{i},{i},{i / 7:.4f},{'true' if i % 2 else 'false'}" for i in range(size(100_000))]
+
+    def replay_run():
+        with iinput.using(ReplaySource(replay)):
+            for i in range(len(replay)):
+                iinput.integer(f"field {i}")
+
+    return {
+        'format_prompt': lambda: format_prompt("{} [y/n]:", "deploy to production", 'n'),
+        'interpret_type/short': lambda: [utils.interpret_type(a) for a in answers],
+        'auto_cast/short': lambda: utils.auto_cast(list(answers), [str, int, float, bool]),
+        'auto_cast/short/extras': lambda: utils.auto_cast(list(answers), [str, int, bool, Decimal, HexInt, IPv4Address]),
+        'split_ws/1M': lambda: utils.split_ws(line, ','),
+        'iter_split_ws/1M': lambda: sum(1 for _ in utils.iter_split_ws(line, ',')),
+        'auto_cast/1M': lambda: utils.auto_cast(utils.split_ws(line, ','), [int]),
+        'bulk_cast/1M': lambda: utils.bulk_cast(line, ',', [int, float]),
+        'validators/short': lambda: [validators.string(a) for a in answers],
+        'yn': prompt_loop(iinput.yn, ['y'], 'continue?'),
+        'integer': prompt_loop(iinput.integer, ['42'], 'count'),
+        'email': prompt_loop(iinput.email, ['ops@example.com'], 'email'),
+        'regex': prompt_loop(iinput.regex, ['abc-123'], 'id', r'^[a-z]+-\d+$'),
+        'integer/retries': prompt_loop(iinput.integer, retries, 'count'),
+        'selection/huge': prompt_loop(iinput.selection, [last], menu),
+        'selection/huge/filter': prompt_loop(iinput.selection, ['/host-0999', last], menu, page_size=20),
+        'multiselection/huge/range': prompt_loop(iinput.multiselection, ['*, !100-199'], menu),
+        'form/validate': lambda: form.validate(record),
+        'replay/10k': replay_run,
+        'table/100k': lambda: Table(['host', 'port', 'ratio', 'primary'], [str, int, float, bool]).extend(rows),
+    }
+
+
+def calibration():
+    return sum(i * i for i in range(10_000))
+
+
+def loops(op, min_time):
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            return number
+        number *= 2
+
+
+def timed(op, number):
+    # like timeit, keep collector passes out of the timed loop
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            op()
+        return number / (time.perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def measure(op, min_time=0.9, repeat=9):
+    # every repeat is paired with a calibration run right after it, so a machine that speeds up or slows down
+    # during the suite shifts both; the median keeps a few noisy repeats from deciding the result
+    op()
+    number = loops(op, min_time / repeat)
+    reference = loops(calibration, min_time / repeat / 4)
+    rates, scores = [], []
+    for _ in range(repeat):
+        rate = timed(op, number)
+        rates.append(rate)
+        scores.append(rate / timed(calibration, reference))
+    tracemalloc.start()
+    op()
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(rates), statistics.median(scores), allocated
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="iinput hot path micro-benchmarks")
+    parser.add_argument('-k', '--filter', default='', help="only run cases whose name contains this")
+    parser.add_argument('--scale', type=float, default=1.0, help="corpus size multiplier")
+    parser.add_argument('--threshold', type=float, default=float(os.environ.get('IINPUT_BENCH_THRESHOLD', 0.35)),
+                        help="allowed slowdown against the baseline, as a fraction")
+    parser.add_argument('--baselines', default=BASELINES)
+    parser.add_argument('--update', action='store_true', help="store the results as the new baselines")
+    args = parser.parse_args(argv)
+
+    if args.scale != 1.0 and args.update:
+        parser.error("baselines are only recorded at --scale 1")
+    baselines = load_baselines(args.baselines) if args.scale == 1.0 else {}
+    results, regressions = {}, []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        selected = {name: op for name, op in cases(args.scale).items() if args.filter in name}
+        for name, op in selected.items():
+            rate, score, allocated = measure(op)
+            results[name] = float(f"{score:.4g}")
+            baseline = baselines.get(name)
+            change = ''
+            if baseline is not None:
+                ratio = score / baseline
+                change = f"{ratio:6.2f}x"
+                if ratio < 1 - args.threshold:
+                    regressions.append(name)
+                    change += '  REGRESSION'
+            sys.stderr.write(f"{name:28} {rate:14,.1f} ops/s {allocated:14,d} B/op {change}\n")
+
+    if args.update:
+        baselines.update(results)
+        with open(args.baselines, 'w') as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=2)
+            f.write('\n')
+    if regressions and not args.update:
+        sys.stderr.write(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}\n")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
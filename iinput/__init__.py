@@ -1 +1,6 @@
 from iinput.iinput import iinput
+from iinput.menu import Menu
+from iinput.sources import InputSource, TTYSource, PipeSource, FileSource, ListSource, PromptTimeout
+from iinput.form import Form, Field
+from iinput.replay import ReplaySource
+from iinput.table import Table
@@ -0,0 +1,6 @@
+import sys
+
+from iinput.cli import main
+
+
+sys.exit(main())
@@ -0,0 +1,116 @@
+import asyncio
+import concurrent.futures
+import sys
+import weakref
+from typing import Optional
+
+from iinput import sources
+from iinput.sources import InputSource, PromptTimeout
+
+
+
+class StdinReader:
+
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, stream=None):
+        self.loop = loop
+        self.stream = stream or sys.stdin
+        self.reader = sources.stream_reader(self.stream)
+        self.readable = asyncio.Event()
+
+
+    async def _next_line(self):
+        try:
+            self.loop.add_reader(self.reader.fd, self.readable.set)
+        except (NotImplementedError, ValueError, OSError):
+            return await self.loop.run_in_executor(None, self.reader.readline)
+        try:
+            line = self.reader.poll()
+            while line is None:
+                self.readable.clear()
+                await self.readable.wait()
+                line = self.reader.poll(True)
+        finally:
+            self.loop.remove_reader(self.reader.fd)
+        return self.reader.finish(line)
+
+
+    async def readline(self, prompt: str = '') -> str:
+        if prompt:
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+        if self.reader is None:
+            line = await self.loop.run_in_executor(None, self.stream.readline)
+            if not line:
+                raise EOFError
+            return line[:-1] if line[-1] == '\n' else line
+        return await self._next_line()
+
+
+class _Bridge(InputSource):
+
+
+    def __init__(self, loop, reader, source):
+        self.loop = loop
+        self.reader = reader
+        self.source = source
+        self.interactive = source.interactive
+        self.pending = None
+        self.cancelled = False
+
+
+    def readline(self, prompt: str = '', timeout: Optional[float] = None) -> str:
+        if self.cancelled:
+            raise concurrent.futures.CancelledError
+        self.pending = asyncio.run_coroutine_threadsafe(
+            self.reader.readline(prompt if self.interactive else ''), self.loop)
+        try:
+            return self.pending.result(timeout)
+        except concurrent.futures.TimeoutError:
+            self.pending.cancel()
+            raise PromptTimeout from None
+
+
+    def getpass(self, prompt: str = '', timeout: Optional[float] = None) -> str:
+        return self.source.getpass(prompt) if timeout is None else self.source.getpass(prompt, timeout)
+
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        if self.pending is not None:
+            self.pending.cancel()
+
+
+_locks = weakref.WeakKeyDictionary()
+_DONE = object()
+
+
+def _call(source, method, args, kwargs):
+    with sources.using(source):
+        return method(*args, **kwargs)
+
+
+async def run(method, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    if loop not in _locks:
+        _locks[loop] = asyncio.Lock()
+    source = sources.get_source()
+    async with _locks[loop]:
+        if sources.reads_stdin(source):
+            source = _Bridge(loop, StdinReader(loop), source)
+        future = loop.run_in_executor(None, _call, source, method, args, kwargs)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if isinstance(source, _Bridge):
+                source.cancel()
+            raise
+
+
+async def iterate(method, *args, **kwargs):
+    items = method(*args, **kwargs)
+    while True:
+        item = await run(next, items, _DONE)
+        if item is _DONE:
+            return
+        yield item
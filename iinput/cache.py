@@ -0,0 +1,159 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from iinput.menu import Menu
+
+
+
+UNCACHED = frozenset(['match_value', 'match_values', 'match_password', 'lines', 'table', 'wait_for_key_press',
+                      'wait_for_some_key_press', 'wait_for_any_key_press', 'wait_for_enter'])
+SECRET = frozenset(['password'])
+
+_MISS = object()
+
+
+def _encode(value):
+    if isinstance(value, Menu):
+        return dict(value.options)
+    elif isinstance(value, type):
+        return value.__name__
+    elif hasattr(value, 'pattern') and hasattr(value, 'flags'):
+        return [value.pattern, value.flags]
+    return repr(value)
+
+
+def _dump(value):
+    try:
+        text = json.dumps([type(value) is tuple, value])
+    except (TypeError, ValueError):
+        return None
+    # only answers that survive the round trip unchanged are persisted; the rest stay in memory
+    return text if _load(text) == value else None
+
+
+def _load(text):
+    is_tuple, value = json.loads(text)
+    return tuple(value) if is_tuple else value
+
+
+class AnswerCache:
+
+    MISS = _MISS
+
+
+    def __init__(self, ttl: Optional[float] = None, maxsize: int = 1024, path: Optional[str] = None, secrets: bool = False):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.secrets = secrets
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, value BLOB, stored REAL, used REAL)")
+            self.db.commit()
+
+
+    def cacheable(self, method: str) -> bool:
+        return method not in UNCACHED and (self.secrets or method not in SECRET)
+
+
+    @staticmethod
+    def key(method: str, args: tuple, kwargs: dict) -> str:
+        return json.dumps([method, args, kwargs], default=_encode, sort_keys=True)
+
+
+    def _fresh(self, stored):
+        return self.ttl is None or time.time() - stored < self.ttl
+
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, stored = entry
+                if self._fresh(stored):
+                    self.entries.move_to_end(key)
+                    return value
+                del self.entries[key]
+            if self.db is None:
+                return default
+            row = self.db.execute("SELECT value, stored FROM answers WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return default
+            if not self._fresh(row[1]):
+                self.db.execute("DELETE FROM answers WHERE key = ?", (key,))
+                self.db.commit()
+                return default
+            try:
+                value = _load(row[0])
+            except (TypeError, ValueError):
+                self.db.execute("DELETE FROM answers WHERE key = ?", (key,))
+                self.db.commit()
+                return default
+            self.db.execute("UPDATE answers SET used = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+            self._remember(key, value, row[1])
+            return value
+
+
+    def _remember(self, key, value, stored):
+        self.entries[key] = (value, stored)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+    def put(self, key: str, value: Any, persist: bool = True) -> None:
+        now = time.time()
+        with self.lock:
+            self._remember(key, value, now)
+            if self.db is None or not persist:
+                return
+            text = _dump(value)
+            if text is None:
+                return
+            self.db.execute("INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?)", (key, text, now, now))
+            self.db.execute("DELETE FROM answers WHERE key NOT IN (SELECT key FROM answers ORDER BY used DESC LIMIT ?)", (self.maxsize,))
+            self.db.commit()
+
+
+    def lookup(self, method: str, args: tuple, kwargs: dict) -> Tuple[Optional[str], Any]:
+        if not self.cacheable(method):
+            return None, _MISS
+        key = self.key(method, args, kwargs)
+        return key, self.get(key, _MISS)
+
+
+    def store(self, method: str, key: str, value: Any) -> None:
+        self.put(key, value, persist=method not in SECRET)
+
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM answers")
+                self.db.commit()
+
+
+    def close(self) -> None:
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+    def __enter__(self):
+        from iinput import iinput
+        iinput.set_cache(self)
+        return self
+
+
+    def __exit__(self, *exc_info):
+        from iinput import iinput
+        iinput.set_cache(None)
+        self.close()
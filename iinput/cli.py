@@ -0,0 +1,116 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Optional, Sequence
+
+from iinput.form import Form
+
+
+
+_form = None
+
+
+def _init_worker(spec):
+    global _form
+    _form = Form.from_spec(spec)
+
+
+def _check_chunk(records, fmt, header):
+    results = []
+    for record in records:
+        try:
+            if fmt == 'jsonl':
+                result = _form.validate_json(record)
+            else:
+                result = _form.validate_csv_row(record, header)
+        except ValueError as e:
+            results.append({'record': str(e)})
+        else:
+            results.append(result.errors)
+    return results
+
+
+def _chunks(records, chunk_size):
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_records(stream, fmt: str) -> Iterator:
+    if fmt == 'jsonl':
+        return (line for line in stream if line.strip())
+    return csv.reader(stream)
+
+
+def validate_records(spec: dict, records, fmt: str, header: Optional[Sequence[str]] = None,
+                     workers: int = 0, chunk_size: int = 1000) -> Iterator[dict]:
+    chunks = _chunks(iter(records), chunk_size)
+    if workers <= 1:
+        _init_worker(spec)
+        for chunk in chunks:
+            yield from _check_chunk(chunk, fmt, header)
+        return
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(spec,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_check_chunk, chunk, fmt, header))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def load_spec(path: str) -> dict:
+    with open(path) as f:
+        if path.endswith(('.yaml', '.yml')):
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def validate(args) -> int:
+    spec = load_spec(args.schema)
+    Form.from_spec(spec)
+    fmt = args.format or ('jsonl' if args.input.endswith(('.jsonl', '.json', '.ndjson')) else 'csv')
+    source = sys.stdin if args.input == '-' else open(args.input, newline='')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    failed = total = 0
+    try:
+        records = iter_records(source, fmt)
+        header = next(records, None) if fmt == 'csv' else None
+        results = validate_records(spec, records, fmt, header, args.workers, args.chunk_size)
+        for total, errors in enumerate(results, 1):
+            if errors:
+                failed += 1
+            elif args.failures_only:
+                continue
+            output.write(json.dumps({'record': total, 'valid': not errors, 'errors': errors}) + '\n')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    sys.stderr.write(f"{total - failed} of {total} records valid\n")
+    return 1 if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m iinput')
+    commands = parser.add_subparsers(dest='command', required=True)
+    command = commands.add_parser('validate', help="validate answer records against a form schema")
+    command.add_argument('schema', help="JSON (or YAML) form spec, as accepted by Form.from_spec")
+    command.add_argument('input', help="CSV file with a header row or JSONL file, '-' for stdin")
+    command.add_argument('-o', '--output', default='-', help="where to write the per-record results (JSONL)")
+    command.add_argument('-f', '--format', choices=['csv', 'jsonl'], help="input format, guessed from the extension by default")
+    command.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help="worker processes, 0 or 1 to validate in-process")
+    command.add_argument('-c', '--chunk-size', type=int, default=1000, help="records sent to a worker at a time")
+    command.add_argument('--failures-only', action='store_true', help="only write records that failed")
+    args = parser.parse_args(argv)
+    return validate(args)
@@ -0,0 +1,151 @@
+import threading
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+from iinput import utils
+
+
+
+class HexInt(int):
+    pass
+
+
+class Converter(NamedTuple):
+    type: type
+    convert: Callable[[str], Any]
+    recognize: Callable[[str], bool]
+    cost: int
+
+
+def _always(s):
+    return True
+
+
+_registry = {}
+_dispatch = {}
+_lock = threading.Lock()
+
+
+def register(type_: type, convert: Callable[[str], Any], recognize: Optional[Callable[[str], bool]] = None, cost: int = 50) -> None:
+    with _lock:
+        _registry[type_] = Converter(type_, convert, recognize or _always, cost)
+        _dispatch.clear()
+
+
+def unregister(type_: type) -> None:
+    with _lock:
+        _registry.pop(type_, None)
+        _dispatch.clear()
+
+
+def _hex(s):
+    return HexInt(int(s, 16))
+
+
+def _is_hex(s):
+    return s[:2] in ('0x', '0X') or s[:3] in ('-0x', '+0x', '-0X', '+0X')
+
+
+def _is_uuid(s):
+    return len(s) in (32, 36, 38, 45) and s[-1] != '.'
+
+
+def _is_ipv4(s):
+    return s[:1].isdigit() and s.count('.') == 3
+
+
+def _is_ipv6(s):
+    return ':' in s
+
+
+def _is_date(s):
+    return len(s) >= 10 and s[4] == '-' and s[:4].isdigit()
+
+
+def _is_time(s):
+    return len(s) >= 5 and s[2] == ':' and s[:2].isdigit()
+
+
+def _is_decimal(s):
+    return s[:1] in utils._NUMERIC_START or s.lstrip('+-')[:3].lower() in ('nan', 'inf', 'snan')
+
+
+def _datetime(name):
+    import datetime
+    cls = getattr(datetime, name)
+    return cls.fromisoformat, _is_time if name == 'time' else _is_date
+
+
+def _ipaddress(name):
+    import ipaddress
+    return getattr(ipaddress, name), _is_ipv6 if name.startswith('IPv6') else _is_ipv4
+
+
+def _uuid(name):
+    import uuid
+    return uuid.UUID, _is_uuid
+
+
+def _decimal(name):
+    import decimal
+
+    def convert(s):
+        try:
+            return decimal.Decimal(s)
+        except decimal.InvalidOperation:
+            raise ValueError(f"invalid decimal {s!r}") from None
+    return convert, _is_decimal
+
+
+# stdlib types are only imported once a caller asks for them
+BUILTIN = {
+    ('decimal', 'Decimal'): (_decimal, 40),
+    ('datetime', 'datetime'): (_datetime, 30),
+    ('datetime', 'date'): (_datetime, 30),
+    ('datetime', 'time'): (_datetime, 30),
+    ('ipaddress', 'IPv4Address'): (_ipaddress, 20),
+    ('ipaddress', 'IPv6Address'): (_ipaddress, 20),
+    ('ipaddress', 'IPv4Network'): (_ipaddress, 25),
+    ('ipaddress', 'IPv6Network'): (_ipaddress, 25),
+    ('uuid', 'UUID'): (_uuid, 10),
+}
+
+register(HexInt, _hex, _is_hex, 10)
+
+
+def converter(type_: type) -> Optional[Converter]:
+    found = _registry.get(type_)
+    if found is None:
+        builtin = BUILTIN.get((getattr(type_, '__module__', None), getattr(type_, '__qualname__', None)))
+        if builtin is not None:
+            factory, cost = builtin
+            convert, recognize = factory(type_.__qualname__)
+            register(type_, convert, recognize, cost)
+            found = _registry[type_]
+    return found
+
+
+def dispatch(allowed_types) -> Tuple[Converter, ...]:
+    key = frozenset(allowed_types)
+    order = _dispatch.get(key)
+    if order is None:
+        found = []
+        for t in key:
+            if t in utils.BUILTIN_TYPES:
+                continue
+            c = converter(t)
+            if c is None:
+                raise TypeError(f"no converter registered for {getattr(t, '__name__', t)!r}")
+            found.append(c)
+        order = tuple(sorted(found, key=lambda c: (c.cost, c.type.__qualname__)))
+        _dispatch[key] = order
+    return order
+
+
+def convert(s: str, order: Tuple[Converter, ...]) -> Any:
+    for c in order:
+        if c.recognize(s):
+            try:
+                return c.convert(s)
+            except ValueError:
+                pass
+    raise ValueError(f"no converter accepted {s!r}")
@@ -0,0 +1,139 @@
+import csv
+import json
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
+
+from iinput import utils, validators
+
+
+
+TYPE_NAMES = {
+    int: 'integer', 'int': 'integer',
+    float: 'floating_point', 'float': 'floating_point',
+    bool: 'boolean', 'bool': 'boolean',
+    str: 'string', 'str': 'string',
+}
+
+UNSTRIPPED = frozenset(['character', 'line', 'password', 'regex'])
+# min / max bound the value of numeric kinds and the length of text and list kinds
+BOUNDED = {'integer': None, 'floating_point': None, 'number': None,
+           'string': len, 'alpha': len, 'alphanumeric': len, 'line': len, 'password': len, 'values': len}
+
+
+class Field:
+
+
+    def __init__(self, kind: Any = 'string', default: Any = None, required: bool = True, choices: Optional[Iterable] = None,
+                 min: Any = None, max: Any = None, pattern: Any = None, prompt: Optional[str] = None, **options):
+        kind = TYPE_NAMES.get(kind, kind)
+        if kind not in validators.VALIDATORS:
+            raise ValueError(f"unknown field kind {kind!r}")
+        if kind == 'regex':
+            if pattern is None:
+                raise ValueError("regex fields need a pattern")
+            options['r'] = utils.compile_pattern(pattern, options.pop('flags', 0))
+            pattern = None
+        if (min is not None or max is not None) and kind not in BOUNDED:
+            raise ValueError(f"{kind} fields do not support min or max")
+        if any(bound is not None and not isinstance(bound, (int, float)) for bound in (min, max)):
+            raise ValueError("min and max must be numbers")
+        if 'allowed_types' in options:
+            options['allowed_types'] = [{'int': int, 'float': float, 'bool': bool, 'str': str}.get(t, t) for t in options['allowed_types']]
+        self.kind = kind
+        self.default = default
+        self.required = required
+        self.choices = frozenset(choices) if choices is not None else None
+        self.min = min
+        self.max = max
+        self.pattern = utils.compile_pattern(pattern) if pattern is not None else None
+        self.prompt = prompt
+        self.strip = kind not in UNSTRIPPED
+        self.measure = BOUNDED.get(kind)
+        self.convert = validators.VALIDATORS[kind]
+        self.options = options
+
+
+    def check(self, raw: Any) -> Any:
+        if raw is not None and not isinstance(raw, str):
+            raw = str(raw)
+        if raw is None or not (raw.strip() if self.strip else raw):
+            if self.default is not None:
+                return self.default
+            elif not self.required:
+                return None
+            raise ValueError("required")
+        if self.pattern is not None and not self.pattern.search(raw):
+            raise ValueError(f"expected input matching {self.pattern.pattern!r}")
+        value = self.convert(raw, **self.options)
+        size = value if self.measure is None else self.measure(value)
+        if self.min is not None and size < self.min:
+            raise ValueError(f"expected at least {self.min}")
+        if self.max is not None and size > self.max:
+            raise ValueError(f"expected at most {self.max}")
+        if self.choices is not None and value not in self.choices:
+            raise ValueError(f"expected one of {', '.join(sorted(map(str, self.choices)))}")
+        return value
+
+
+class FormResult:
+
+
+    def __init__(self, values: Dict[str, Any], errors: Dict[str, str]):
+        self.values = values
+        self.errors = errors
+
+
+    def __bool__(self) -> bool:
+        return not self.errors
+
+
+    def __repr__(self) -> str:
+        return f"FormResult(values={self.values!r}, errors={self.errors!r})"
+
+
+class Form:
+
+
+    def __init__(self, fields: Mapping[str, Any]):
+        self.fields = {name: field if isinstance(field, Field) else Field(field) for name, field in fields.items()}
+
+
+    @classmethod
+    def from_spec(cls, spec: Mapping[str, Any]) -> 'Form':
+        return cls({name: Field(**field) if isinstance(field, Mapping) else Field(field) for name, field in spec.items()})
+
+
+    def validate(self, record: Mapping[str, Any]) -> FormResult:
+        values, errors = {}, {}
+        for name, field in self.fields.items():
+            try:
+                values[name] = field.check(record.get(name))
+            except ValueError as e:
+                errors[name] = str(e)
+        return FormResult(values, errors)
+
+
+    def validate_json(self, text: str) -> FormResult:
+        record = json.loads(text)
+        if not isinstance(record, dict):
+            raise ValueError("expected a JSON object")
+        return self.validate(record)
+
+
+    def validate_csv_row(self, row: Any, header: Optional[Sequence[str]] = None) -> FormResult:
+        if isinstance(row, str):
+            row = next(csv.reader([row]))
+        if header is None:
+            if len(row) > len(self.fields):
+                raise ValueError(f"expected at most {len(self.fields)} cells, got {len(row)}")
+            header = list(self.fields)
+        return self.validate(dict(zip(header, row)))
+
+
+    def fill(self) -> Dict[str, Any]:
+        from iinput.iinput import _ask, _read, _read_secret, format_prompt
+        values = {}
+        for name, field in self.fields.items():
+            prompt = format_prompt("{}:", field.prompt or name, field.default)
+            read = _read_secret if field.kind == 'password' else _read
+            values[name] = _ask(prompt, None, field.check, strip=field.strip, read=read)
+        return values
@@ -0,0 +1,77 @@
+import threading
+from collections import namedtuple
+from typing import Iterable, Optional
+
+import keyboard
+
+
+
+_Spec = namedtuple('_Spec', ['name', 'parts'])
+
+
+def _spec(key):
+    key = key.lower()
+    parts = frozenset(p.strip() for p in key.split('+')) if len(key) > 1 else frozenset([key])
+    return _Spec(key, parts)
+
+
+class _Waiter:
+
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.key = None
+
+
+    def fire(self, key):
+        if self.key is None:
+            self.key = key
+            self.event.set()
+
+
+class KeyDispatcher:
+
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.index = {}
+        self.pressed = set()
+        self.hook = None
+
+
+    def _on_event(self, event):
+        name = (event.name or '').lower()
+        if event.event_type != keyboard.KEY_DOWN:
+            self.pressed.discard(name)
+            return
+        self.pressed.add(name)
+        with self.lock:
+            for spec, waiter in self.index.get(name, ()):
+                if spec.parts <= self.pressed:
+                    waiter.fire(spec.name)
+
+
+    def wait(self, keys: Iterable[str], timeout: Optional[float] = None) -> Optional[str]:
+        waiter = _Waiter()
+        entries = [(part, (spec, waiter)) for spec in map(_spec, keys) for part in spec.parts]
+        with self.lock:
+            for part, entry in entries:
+                self.index.setdefault(part, set()).add(entry)
+            if self.hook is None:
+                self.hook = keyboard.hook(self._on_event)
+        try:
+            waiter.event.wait(timeout)
+            return waiter.key
+        finally:
+            with self.lock:
+                for part, entry in entries:
+                    self.index[part].discard(entry)
+                    if not self.index[part]:
+                        del self.index[part]
+                if not self.index and self.hook is not None:
+                    keyboard.unhook(self.hook)
+                    self.hook = None
+                    self.pressed.clear()
+
+
+dispatcher = KeyDispatcher()
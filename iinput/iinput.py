@@ -1,13 +1,19 @@
-import os
+import functools
 import sys
-import re
-import platform
-import getpass
-from typing import Any, Dict, List, Tuple, Match
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Mapping, Optional, Tuple, Match, Pattern, Union
 
-import keyboard
+from iinput import sources, utils, validators
+from iinput import terminal
+from iinput.menu import Menu
+from iinput.table import Table
+from iinput.sources import InputSource
 
-from iinput import utils
+if TYPE_CHECKING:
+    from iinput.cache import AnswerCache
+    from iinput.metrics import PromptRecord
+    from iinput.scheduler import PromptScheduler
 
 
 
@@ -18,6 +24,189 @@ def format_prompt(f, p, d=None):
     return p
 
 
+_CO_GENERATOR = 0x20
+
+
+def _asyncify(method):
+    if method.__code__.co_flags & _CO_GENERATOR:
+        @functools.wraps(method)
+        async def iterator(*args, **kwargs):
+            from iinput import aio
+            async for item in aio.iterate(method, *args, **kwargs):
+                yield item
+        return iterator
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        from iinput import aio
+        return await aio.run(method, *args, **kwargs)
+    return wrapper
+
+
+_scheduler = None
+_cache = None
+_metrics = ()
+_DONE = object()
+
+
+def _next(items, end, expire_empty):
+    if end is None:
+        return next(items, _DONE)
+    with sources.deadline(end, expire_empty):
+        return next(items, _DONE)
+
+
+def _prompt_method(method):
+    code = method.__code__
+    names = code.co_varnames[:code.co_argcount]
+    defaults = dict(zip(reversed(names), reversed(method.__defaults__ or ())))
+    position = names.index('default') if 'default' in names else -1
+    prompt_position = names.index('prompt')
+    name = method.__name__
+
+    if code.co_flags & _CO_GENERATOR:
+        @functools.wraps(method)
+        def generator(*args, timeout: Optional[float] = None, deadline: Optional[float] = None, **kwargs):
+            items = method(*args, **kwargs)
+            end = sources.deadline_for(timeout, deadline)
+            default = kwargs.get('default', args[position] if 0 <= position < len(args) else defaults.get('default'))
+            expire_empty = position >= 0 and default is not None
+            # the deadline only covers the reads, not the caller's work between items, and each read is queued
+            # on the scheduler like any other prompt
+            while True:
+                scheduler = _scheduler
+                if scheduler is not None and scheduler.thread is not threading.current_thread():
+                    item = scheduler.ask(_next, items, end, expire_empty, coalesce=False)
+                else:
+                    item = _next(items, end, expire_empty)
+                if item is _DONE:
+                    return
+                yield item
+        return generator
+
+    @functools.wraps(method)
+    def wrapper(*args, timeout: Optional[float] = None, deadline: Optional[float] = None, **kwargs):
+        scheduler = _scheduler
+        if scheduler is not None and scheduler.thread is not threading.current_thread():
+            return scheduler.ask(wrapper, *args, timeout=timeout, deadline=deadline, **kwargs)
+        if _metrics:
+            return measured(args, kwargs, timeout, deadline)
+        return cached(args, kwargs, timeout, deadline)
+
+    def measured(args, kwargs, timeout, deadline):
+        from iinput.metrics import PromptRecord
+        prompt = kwargs.get('prompt', args[prompt_position] if prompt_position < len(args) else defaults.get('prompt', ''))
+        record = PromptRecord(name, str(prompt))
+        start = time.thread_time()
+        try:
+            with sources.recording(record):
+                answer = cached(args, kwargs, timeout, deadline)
+        except sources.PromptTimeout:
+            record.outcome = 'timeout'
+            raise
+        except BaseException:
+            record.outcome = 'error'
+            raise
+        else:
+            if record.expired:
+                record.outcome = 'timeout'
+            elif record.attempts == 0 and _cache is not None:
+                record.outcome = 'cached'
+            elif record.blank:
+                record.outcome = 'default'
+            else:
+                record.outcome = 'answered'
+            return answer
+        finally:
+            record.cpu = time.thread_time() - start
+            for sink in _metrics:
+                sink(record)
+
+    def cached(args, kwargs, timeout, deadline):
+        cache = _cache
+        if cache is None:
+            return timed(args, kwargs, timeout, deadline)
+        key, answer = cache.lookup(name, args, kwargs)
+        if answer is not cache.MISS:
+            return answer
+        sources.pop_expired()
+        answer = timed(args, kwargs, timeout, deadline)
+        # a default returned because time ran out is not an answer worth keeping
+        if key is not None and not sources.pop_expired():
+            cache.store(name, key, answer)
+        return answer
+
+    def timed(args, kwargs, timeout, deadline):
+        end = sources.deadline_for(timeout, deadline)
+        if end is None:
+            return method(*args, **kwargs)
+        default = kwargs.get('default', args[position] if 0 <= position < len(args) else defaults.get('default'))
+        with sources.deadline(end, position >= 0 and default is not None):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def _read(prompt):
+    return sources.read(prompt)
+
+
+def _read_secret(prompt):
+    return sources.read(prompt, secret=True)
+
+
+def _read_key(prompt, keys=None):
+    while True:
+        key = str(_read(prompt)).strip()
+        if keys is None or key in keys:
+            return key
+
+
+def _expired(key):
+    if key is None:
+        raise sources.PromptTimeout
+    return key
+
+
+def _ask(prompt, default, validate, *args, strip=True, read=_read):
+    while True:
+        inp = str(read(prompt))
+        if not (inp.strip() if strip else inp) and default is not None:
+            return default
+        try:
+            return validate(inp, *args)
+        except ValueError:
+            pass
+
+
+def _paged_selection(menu, header, prompt, default, page_size):
+    matches = range(len(menu))
+    query = ''
+    page = 0
+    while True:
+        pages = max(1, -(-len(matches) // page_size))
+        page = max(0, min(page, pages - 1))
+        sys.stdout.write(menu.render_page(matches, page, page_size, header, query))
+        inp = str(_read(prompt)).strip()
+        if not inp and default is not None:
+            return default, menu.options.get(default, None)
+        elif inp == '>':
+            page += 1
+        elif inp == '<':
+            page -= 1
+        elif inp.startswith('/'):
+            new_query = inp[1:].strip().lower()
+            if not new_query:
+                matches = range(len(menu))
+            else:
+                # every query is a substring match, so a longer query containing the last one can only narrow it
+                within = matches if query and query in new_query else None
+                matches = menu.search(new_query, within)
+            query = new_query
+            page = 0
+        elif inp in menu.options:
+            return inp, menu.options[inp]
+
+
 class __iinput:
     
 
@@ -26,241 +215,236 @@ class __iinput:
 
 
     def __call__(self, prompt: str = ''):
-        return input(prompt)
+        return _read(prompt)
+
+
+    @staticmethod
+    def set_source(source: InputSource = None) -> None:
+        sources.set_source(source)
+
+
+    @staticmethod
+    def using(source: InputSource):
+        return sources.using(source)
+
+
+    @staticmethod
+    def set_scheduler(scheduler: 'PromptScheduler' = None) -> None:
+        global _scheduler
+        _scheduler = scheduler
+
+
+    @staticmethod
+    def set_cache(cache: 'AnswerCache' = None) -> None:
+        global _cache
+        _cache = cache
+
+
+    @staticmethod
+    def set_metrics(*sinks: Callable[['PromptRecord'], None]) -> None:
+        global _metrics
+        _metrics = tuple(sink for sink in sinks if sink is not None)
+
+
+    @staticmethod
+    def set_timeout(seconds: Optional[float] = None) -> None:
+        sources.set_timeout(seconds)
 
 
     @staticmethod
     def yn(prompt: str, default: Any = None) -> str:
         prompt = format_prompt("{} [y/n]:", prompt, default)
-        inp = None
-        while inp not in ['y', 'n']:
-            inp = str(input(prompt)).strip().lower()
-            if not inp and default is not None:
-                return default
-        return inp
+        return _ask(prompt, default, validators.yn)
 
 
     @staticmethod
     def value(prompt: str, allowed_types: List[type] = [str], default: str = '') -> Any:
         prompt = format_prompt("{}:", prompt, default)
-        inp = None
-        while inp is None:
-            inp = str(input(prompt)).strip()
-            if not inp and default is not None:
-                return default
-            inp, = utils.auto_cast([inp], allowed_types=allowed_types)
-        return inp
+        return _ask(prompt, default, validators.value, allowed_types)
 
 
     @staticmethod
-    def values(prompt: str, delimiter: str = ',', allowed_types: List[type] = [str], default: list = []) -> list:
+    def values(prompt: str, delimiter: str = ',', allowed_types: List[type] = [str], default: list = [], bulk: bool = False) -> list:
         prompt = format_prompt("{}:", prompt, default)
         inp = items = None
         while not (inp and items):
-            inp = str(input(prompt)).strip()
+            inp = str(_read(prompt)).strip()
             if not inp and default is not None:
                 return default
+            if bulk:
+                items = utils.bulk_cast(inp, delimiter, allowed_types)
+                if items is not None and len(items):
+                    return items
             items = utils.split_ws(inp, delimiter)
             items = utils.auto_cast(items, allowed_types)
         return items
 
 
+    @staticmethod
+    def iter_values(prompt: str, delimiter: str = ',', allowed_types: List[type] = [str], default: list = []) -> Iterator[Any]:
+        prompt = format_prompt("{}:", prompt, default)
+        inp = ''
+        while not inp:
+            inp = str(_read(prompt)).strip()
+            if not inp and default is not None:
+                yield from default
+                return
+        yield from utils.iter_cast(utils.iter_split_ws(inp, delimiter), allowed_types)
+
+
     @staticmethod
     def match_value(prompt: str, target: str, max_attempts: int = -1) -> bool:
         prompt = format_prompt("{}:", prompt)
         target = str(target)
         attempts = 0
         inp = None
-        while attempts < max_attempts and inp != target:
-            inp = str(input(prompt))
+        while (max_attempts < 0 or attempts < max_attempts) and inp != target:
+            inp = str(_read(prompt))
             attempts += 1
-        return attempts != max_attempts
+        return inp == target
 
 
     @staticmethod
-    def match_values(prompt: str, targets: list, delimiter: str = ',', max_attempts: int = -1) -> bool:
+    def match_values(prompt: str, targets: list, delimiter: str = ',', max_attempts: int = -1, multiset: bool = True) -> utils.MatchResult:
         prompt = format_prompt("{}:", prompt)
-        targets = [str(v) for v in targets]
+        targets = utils.target_set(targets, multiset)
         attempts = 0
-        inps = []
-        while attempts < max_attempts and sorted(inps) != sorted(targets):
-            inp = str(input(prompt))
-            inps = utils.split_ws(inp, delimiter)
+        while max_attempts < 0 or attempts < max_attempts:
+            inps = utils.split_ws(str(_read(prompt)), delimiter)
             attempts += 1
-        return attempts != max_attempts
+            missing, extra = utils.compare_values(targets, inps)
+            if not (missing or extra):
+                return utils.MatchResult(True, attempts=attempts)
+            if inps:
+                print(f"missing: {', '.join(missing) or '-'} | extra: {', '.join(extra) or '-'}")
+            if attempts == max_attempts:
+                return utils.MatchResult(False, missing, extra, attempts)
+        return utils.MatchResult(False, *utils.compare_values(targets, []))
 
 
     @staticmethod
     def boolean(prompt: str, default: Any = None) -> bool:
         prompt = format_prompt("{}:", prompt, default)
-        while True:
-            inp = str(input(prompt)).strip().lower()
-            if not inp and default is not None:
-                return default
-            if inp in ['0', '1']:
-                return inp == '1'
-            elif inp in ['false', 'true']:
-                return inp == 'true'
+        return _ask(prompt, default, validators.boolean)
 
 
     @staticmethod
     def number(prompt: str, default: Any = None) -> int or float:
         prompt = format_prompt("{}:", prompt, default)
-        inp = ''
-        while not (utils.isint(inp) or utils.isfloat(inp)):
-            inp = str(input(prompt)).strip()
-            if not inp and default is not None:
-                return default
-        return float(inp) if '.' in inp else int(inp)
+        return _ask(prompt, default, validators.number)
 
 
     @staticmethod
     def integer(prompt: str, default: Any = None) -> int:
         prompt = format_prompt("{}:", prompt, default)
-        inp = ''
-        while not utils.isint(inp):
-            inp = str(input(prompt)).strip()
-            if not inp and default is not None:
-                return default
-        return int(inp)
+        return _ask(prompt, default, validators.integer)
 
 
     @staticmethod
     def floating_point(prompt: str, default: Any = None) -> float:
         prompt = format_prompt("{}:", prompt, default)
-        inp = ''
-        while not utils.isfloat(inp):
-            inp = str(input(prompt)).strip()
-            if not inp and default is not None:
-                return default
-        return float(inp)
+        return _ask(prompt, default, validators.floating_point)
 
 
     @staticmethod
     def character(prompt: str, default: Any = None) -> str:
         prompt = format_prompt("{}:", prompt, default)
-        inp = ''
-        while not utils.ischar(inp):
-            inp = str(input(prompt))
-            if not inp and default is not None:
-                return default
-        return inp
+        return _ask(prompt, default, validators.character, strip=False)
 
 
     @staticmethod
     def string(prompt: str, default: str = '') -> str:
         prompt = format_prompt("{}:", prompt, default)
-        inp = ''
-        while not inp:
-            inp = str(input(prompt)).strip()
-            if not inp and default is not None:
-                return default
-        return inp
+        return _ask(prompt, default, validators.string)
 
 
     @staticmethod
     def alpha(prompt: str, default: Any = None) -> str:
         prompt = format_prompt("{}:", prompt, default)
-        inp = ''
-        while not inp.isalpha():
-            inp = str(input(prompt)).strip()
-            if not inp and default is not None:
-                return default
-        return inp
+        return _ask(prompt, default, validators.alpha)
 
 
     @staticmethod
     def alphanumeric(prompt: str, default: Any = None) -> str:
         prompt = format_prompt("{}:", prompt, default)
-        inp = ''
-        while not inp.isalnum():
-            inp = str(input(prompt)).strip()
-            if not inp and default is not None:
-                return default
-        return inp
+        return _ask(prompt, default, validators.alphanumeric)
 
 
     @staticmethod
     def line(prompt: str, default: str = '') -> str:
         prompt = format_prompt("{}:", prompt, default)
-        inp = None
-        while not inp:
-            inp = str(input(prompt))
-            if not inp and default is not None:
-                return default
-        return inp
+        return _ask(prompt, default, validators.line, strip=False)
 
 
     @staticmethod
     def lines(prompt: str) -> List[str]:
-        prompt = format_prompt("{}: [^d EOI]", prompt)
-        print(prompt)
-        lines = sys.stdin.readlines()
-        lines = [l.rstrip('\n') for l in lines]
-        return lines
+        return list(iinput.iter_lines(prompt))
+
+
+    @staticmethod
+    def iter_lines(prompt: str, chunk_size: int = 1 << 16, max_chars: int = -1, max_lines: int = -1) -> Iterator[str]:
+        source = sources.get_source()
+        if source.interactive:
+            print(format_prompt("{}: [^d EOI]", prompt))
+        if sources.remaining() is not None:
+            yield from InputSource.iter_lines(source, chunk_size, max_chars, max_lines)
+        else:
+            yield from source.iter_lines(chunk_size, max_chars, max_lines)
 
 
     @staticmethod
-    def selection(menu_options: dict, header: str = "menu", prompt: str = "enter selection", default: Any = None) -> Tuple[str, Any]:
-        if header:
-            print(header)
-        for key, value in menu_options.items():
-            print(f"\t[{key}]: {value}")
-        print()
+    def table(prompt: str, columns: List[str], types: Union[type, List[type]] = str, delimiter: str = ',', numpy: bool = False) -> Table:
+        table = Table(columns, types).extend(iinput.iter_lines(prompt), delimiter)
+        if table.errors and sources.get_source().interactive:
+            sys.stdout.write(''.join(f"{error}\n" for error in table.errors))
+        return table.to_numpy() if numpy else table
+
 
+    @staticmethod
+    def selection(menu_options: Union[dict, Menu], header: str = "menu", prompt: str = "enter selection", default: Any = None, page_size: int = 0) -> Tuple[str, Any]:
+        menu = menu_options if isinstance(menu_options, Menu) else Menu(menu_options)
         prompt = format_prompt("{}>", prompt, default)
-        menu_options = {str(k): v for k, v in menu_options.items()}
+        if page_size > 0:
+            return _paged_selection(menu, header, prompt, default, page_size)
+        sys.stdout.write(menu.render(header))
+
         selected_key = None
-        while selected_key not in menu_options:
-            selected_key = str(input(prompt)).strip()
+        while selected_key not in menu.options:
+            selected_key = str(_read(prompt)).strip()
             if not selected_key and default is not None:
-                if default in menu_options:
-                    return default, menu_options[default]
-                else:
-                    return default, None
-        return selected_key, menu_options[selected_key]
+                return default, menu.options.get(default, None)
+        return selected_key, menu.options[selected_key]
 
 
     @staticmethod
-    def multiselection(menu_options: dict, header: str = "menu", prompt: str = "enter selection", delimiter: str = ',', default: Any = None) -> Dict[str, Any]:
-        if header:
-            print(header)
-        for key, value in menu_options.items():
-            print(f"\t[{key}]: {value}")
-        print()
+    def multiselection(menu_options: Union[dict, Menu], header: str = "menu", prompt: str = "enter selection", delimiter: str = ',', default: Any = None) -> Mapping[str, Any]:
+        menu = menu_options if isinstance(menu_options, Menu) else Menu(menu_options)
+        sys.stdout.write(menu.render(header))
 
         prompt = format_prompt("{}>", prompt, default)
-        menu_options = {str(k): v for k, v in menu_options.items()}
-        selected_keys = []
-        while not selected_keys or any(s not in menu_options.keys() for s in selected_keys):
-            inp = str(input(prompt))
+        options = menu.options
+        while True:
+            inp = str(_read(prompt))
             selected_keys = utils.split_ws(inp, delimiter)
             if not selected_keys and default is not None:
-                return {k: menu_options.get(k, None) for k in default} 
-        return {k: menu_options[k] for k in selected_keys} 
+                return {k: options.get(k, None) for k in default}
+            elif selected_keys and all(s in options for s in selected_keys):
+                return {k: options[k] for k in selected_keys}
+            selection = menu.select(selected_keys) if selected_keys else None
+            if selection:
+                return selection
 
 
     @staticmethod
     def email(prompt: str, default: str = '') -> str:
         prompt = format_prompt("{}:", prompt, default)
-        email = None
-        while not email:
-            inp = str(input(prompt)).strip()
-            if not inp and default is not None:
-                return default
-            email = re.search("[\w\.,]+@[\w\.,]+\.\w+", inp)
-        return email.group(0)
+        return _ask(prompt, default, validators.email)
 
 
     @staticmethod
     def password(prompt: str, default: str = '') -> str:
         prompt = format_prompt("{}:", prompt, default)
-        pwd = None
-        while not pwd:
-            pwd = getpass.getpass(prompt=prompt)
-            if not pwd and default is not None:
-                return default
-        return pwd
+        return _ask(prompt, default, validators.password, strip=False, read=_read_secret)
 
 
     @staticmethod
@@ -269,57 +453,70 @@ class __iinput:
         target = str(target)
         attempts = 0
         pwd = None
-        while attempts < max_attempts and pwd != target:
-            pwd = getpass.getpass(prompt=prompt)
+        while (max_attempts < 0 or attempts < max_attempts) and pwd != target:
+            pwd = _read_secret(prompt)
             attempts += 1
-        return attempts != max_attempts
+        return pwd == target
 
     @staticmethod
-    def regex(prompt: str, r: str, flags: int = 0, default: Any = None) -> Match[str]:
+    def regex(prompt: str, r: Union[str, Pattern[str]], flags: int = 0, default: Any = None) -> Match[str]:
         prompt = format_prompt("{}:", prompt, default)
-        match = None
-        while not match:
-            inp = str(input(prompt))
-            if not inp and default is not None:
-                return default
-            match = re.search(r, inp, flags=flags)
-        return match
+        pattern = utils.compile_pattern(r, flags)
+        return _ask(prompt, default, validators.regex, pattern, strip=False)
 
 
     @staticmethod
-    def wait_for_key_press(key: str, prompt: str = "press '{}' to continue...") -> None:
+    def wait_for_key_press(key: str, prompt: str = "press '{}' to continue...") -> str:
         if not utils.ischar(key):
             raise ValueError(f"{key} is not a valid key")
 
         prompt = prompt.format(key)
+        if not sources.reads_stdin(sources.get_source()):
+            return _read_key(prompt, {key})
         print(f"{prompt} ")
-        keyboard.wait(key)
+        if terminal.is_terminal():
+            return _expired(sources.blocking(terminal.wait_for_key, {key}, timeout=sources.remaining()))
+        from iinput import hotkeys
+        return _expired(sources.blocking(hotkeys.dispatcher.wait, [key], sources.remaining()))
 
 
     @staticmethod
-    def wait_for_some_key_press(keys: List[str], prompt: str = "press {} to continue...") -> None:
+    def wait_for_some_key_press(keys: List[str], prompt: str = "press {} to continue...") -> str:
         if any(not utils.ischar(k) for k in keys):
             raise ValueError(f"{keys} are not valid")
 
         prompt = prompt.format(keys)
+        if not sources.reads_stdin(sources.get_source()):
+            return _read_key(prompt, set(keys))
         print(f"{prompt} ")
-        while True:
-            if keyboard.read_key() in keys:
-                return
+        if terminal.is_terminal():
+            return _expired(sources.blocking(terminal.wait_for_key, set(keys), timeout=sources.remaining()))
+        from iinput import hotkeys
+        return _expired(sources.blocking(hotkeys.dispatcher.wait, keys, sources.remaining()))
 
 
     @staticmethod
     def wait_for_any_key_press(prompt: str = "press any key to continue...") -> None:
-        if platform.system() == "Windows":
-            print(prompt)
-            os.system("pause")
-        else:
-            os.system(f"read -s -n 1 -p \"{prompt}\"")
+        if not sources.reads_stdin(sources.get_source()):
+            _read_key(prompt)
+            return
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        _expired(sources.blocking(terminal.read_key, timeout=sources.remaining()))
 
 
     @staticmethod
     def wait_for_enter(prompt: str = "press ENTER to continue...") -> None:
-        input(prompt)
+        _read(prompt)
+
+
+for name in ['yn', 'value', 'values', 'iter_values', 'match_value', 'match_values', 'boolean', 'number', 'integer',
+             'floating_point', 'character', 'string', 'alpha', 'alphanumeric', 'line', 'lines', 'iter_lines', 'table', 'selection',
+             'multiselection', 'email', 'password', 'match_password', 'regex', 'wait_for_key_press',
+             'wait_for_some_key_press', 'wait_for_any_key_press', 'wait_for_enter']:
+    setattr(__iinput, name, staticmethod(_prompt_method(getattr(__iinput, name))))
+    setattr(__iinput, 'a' + name, staticmethod(_asyncify(getattr(__iinput, name))))
+del name
 
 
 iinput = __iinput()
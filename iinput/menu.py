@@ -0,0 +1,195 @@
+import threading
+from types import MappingProxyType
+from typing import Any, Iterator, List, Mapping, Optional, Sequence
+
+
+
+def _canonical_int(key):
+    return key.isascii() and key.isdigit() and (key[0] != '0' or key == '0')
+
+
+class MenuIndex:
+
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.trigrams = {}
+        for i, text in enumerate(texts):
+            for gram in {text[j:j + 3] for j in range(len(text) - 2)}:
+                self.trigrams.setdefault(gram, []).append(i)
+
+
+    def search(self, query: str, within: Optional[Sequence[int]] = None) -> List[int]:
+        texts = self.texts
+        if len(query) < 3:
+            # too short for the trigram index, and most options match anyway
+            return [i for i in (range(len(texts)) if within is None else within) if query in texts[i]]
+        grams = {query[j:j + 3] for j in range(len(query) - 2)}
+        candidates = min((self.trigrams.get(gram, ()) for gram in grams), key=len)
+        if within is not None and len(within) < len(candidates):
+            candidates = within
+        return [i for i in candidates if query in texts[i]]
+
+
+class Selection(Mapping):
+
+
+    def __init__(self, menu: 'Menu', keys):
+        self.menu = menu
+        self.selected = keys
+
+
+    def _iter_bits(self):
+        base = self.menu.int_base
+        bits = bin(self.selected)[:1:-1]
+        position = bits.find('1')
+        while position >= 0:
+            yield str(position + base)
+            position = bits.find('1', position + 1)
+
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self:
+            raise KeyError(key)
+        return self.menu.options[key]
+
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(self.selected, int):
+            return key in self.menu.options and self.selected >> (int(key) - self.menu.int_base) & 1 == 1
+        return key in self.selected
+
+
+    def __iter__(self) -> Iterator[str]:
+        if isinstance(self.selected, int):
+            return self._iter_bits()
+        return (key for key in self.menu.options if key in self.selected)
+
+
+    def __len__(self) -> int:
+        if isinstance(self.selected, int):
+            return bin(self.selected).count('1')
+        return len(self.selected)
+
+
+    def __repr__(self) -> str:
+        return f"Selection({len(self)} of {len(self.menu)} options)"
+
+
+class Menu(Mapping):
+
+
+    def __init__(self, menu_options: dict):
+        self.options = MappingProxyType({str(k): v for k, v in menu_options.items()})
+        self.lines = [f"\t[{key}]: {value}\n" for key, value in menu_options.items()]
+        self.body = ''.join(self.lines) + '\n'
+        self._rendered = {}
+        self._index = None
+        self._int_keys = None
+        self.int_base = 0
+        self._lock = threading.Lock()
+
+
+    def render(self, header: str = "menu") -> str:
+        text = self._rendered.get(header)
+        if text is None:
+            text = f"{header}\n{self.body}" if header else self.body
+            self._rendered[header] = text
+        return text
+
+
+    def render_page(self, matches: Sequence[int], page: int, page_size: int, header: str = "menu", query: str = '') -> str:
+        pages = max(1, -(-len(matches) // page_size))
+        window = matches[page * page_size:(page + 1) * page_size]
+        text = [f"{header}\n"] if header else []
+        text.extend(self.lines[i] for i in window)
+        status = f"page {page + 1}/{pages}, {len(matches)} of {len(self.lines)} options"
+        if query:
+            status += f" matching '{query}'"
+        text.append(f"\n{status} ['>' next, '<' previous, '/text' filter, '/' clear]\n")
+        return ''.join(text)
+
+
+    @property
+    def index(self) -> MenuIndex:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = MenuIndex([f"{k} {v}".lower() for k, v in self.options.items()])
+        return self._index
+
+
+    def search(self, query: str, within: Optional[Sequence[int]] = None) -> List[int]:
+        return self.index.search(query.lower(), within)
+
+
+    @property
+    def int_keys(self) -> int:
+        if self._int_keys is None:
+            values = [int(key) for key in self.options if _canonical_int(key)]
+            low, high = min(values, default=0), max(values, default=0)
+            if len(values) < len(self) or high - low > 8 * len(self) + 1024:
+                self._int_keys = -1
+            else:
+                bits = bytearray((high - low) // 8 + 1)
+                for value in values:
+                    value -= low
+                    bits[value >> 3] |= 1 << (value & 7)
+                self.int_base = low
+                self._int_keys = int.from_bytes(bits, 'little')
+        return self._int_keys
+
+
+    def _token_keys(self, token, int_keys):
+        if token == '*':
+            return int_keys if int_keys >= 0 else frozenset(self.options)
+        elif token in self.options:
+            return 1 << (int(token) - self.int_base) if int_keys >= 0 else frozenset([token])
+        elif '-' in token:
+            lo, _, hi = (part.strip() for part in token.partition('-'))
+            if not (lo.isdigit() and hi.isdigit() and lo.isascii() and hi.isascii() and int(lo) <= int(hi)):
+                return None
+            lo, hi = int(lo), int(hi)
+            if int_keys < 0:
+                return frozenset(key for key in self.options if _canonical_int(key) and lo <= int(key) <= hi)
+            # clip to the bitset before shifting, so a huge range from the operator stays cheap
+            lo, hi = max(lo - self.int_base, 0), min(hi - self.int_base, int_keys.bit_length())
+            if lo > hi:
+                return 0
+            return ((1 << (hi + 1)) - (1 << lo)) & int_keys
+        return None
+
+
+    def select(self, tokens: Sequence[str]) -> Optional[Selection]:
+        int_keys = self.int_keys
+        include = exclude = 0 if int_keys >= 0 else frozenset()
+        has_include = False
+        for token in tokens:
+            negate = token.startswith('!') and token not in self.options
+            keys = self._token_keys(token[1:].strip() if negate else token, int_keys)
+            if keys is None:
+                return None
+            if negate:
+                exclude |= keys
+            else:
+                include |= keys
+                has_include = True
+        if not has_include:
+            include = self._token_keys('*', int_keys)
+        return Selection(self, include & ~exclude if int_keys >= 0 else include - exclude)
+
+
+    def __getitem__(self, key: str) -> Any:
+        return self.options[key]
+
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.options
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.options)
+
+
+    def __len__(self) -> int:
+        return len(self.options)
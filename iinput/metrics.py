@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+OUTCOMES = ('answered', 'default', 'timeout', 'cached', 'error')
+
+
+class PromptRecord:
+
+    __slots__ = ('method', 'prompt', 'wait', 'cpu', 'attempts', 'outcome', 'blank', 'expired')
+
+
+    def __init__(self, method: str, prompt: str):
+        self.method = method
+        self.prompt = prompt
+        self.wait = 0.0
+        self.cpu = 0.0
+        self.attempts = 0
+        self.outcome = None
+        self.blank = False
+        self.expired = False
+
+
+    def __repr__(self) -> str:
+        return (f"PromptRecord(method={self.method!r}, prompt={self.prompt!r}, wait={self.wait:.6f}, "
+                f"cpu={self.cpu:.6f}, attempts={self.attempts}, outcome={self.outcome!r})")
+
+
+class _Series:
+
+
+    def __init__(self, buckets):
+        self.count = 0
+        self.attempts = 0
+        self.wait = [0] * (len(buckets) + 1)
+        self.wait_sum = 0.0
+        self.cpu = [0] * (len(buckets) + 1)
+        self.cpu_sum = 0.0
+        self.outcomes = Counter()
+
+
+class Histogram:
+
+
+    def __init__(self, buckets: Sequence[float] = BUCKETS):
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+
+    def __call__(self, record: PromptRecord) -> None:
+        key = (record.method, record.prompt)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = _Series(self.buckets)
+            series.count += 1
+            series.attempts += record.attempts
+            series.wait[bisect_left(self.buckets, record.wait)] += 1
+            series.wait_sum += record.wait
+            series.cpu[bisect_left(self.buckets, record.cpu)] += 1
+            series.cpu_sum += record.cpu
+            series.outcomes[record.outcome] += 1
+
+
+    def snapshot(self) -> Dict[Tuple[str, str], dict]:
+        with self.lock:
+            return {key: {'count': s.count, 'attempts': s.attempts, 'wait': list(s.wait), 'wait_sum': s.wait_sum,
+                          'cpu': list(s.cpu), 'cpu_sum': s.cpu_sum, 'outcomes': dict(s.outcomes)}
+                    for key, s in self.series.items()}
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _histogram_lines(name, buckets, labels, counts, total, count):
+    lines = []
+    cumulative = 0
+    for bound, bucket in zip(buckets + ('+Inf',), counts):
+        cumulative += bucket
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_sum{{{labels}}} {total}')
+    lines.append(f'{name}_count{{{labels}}} {count}')
+    return lines
+
+
+def prometheus_text(histogram: Histogram) -> str:
+    series = histogram.snapshot()
+    wait = ['# HELP iinput_prompt_wait_seconds Time spent waiting for input.',
+            '# TYPE iinput_prompt_wait_seconds histogram']
+    cpu = ['# HELP iinput_prompt_cpu_seconds CPU time spent rendering and validating.',
+           '# TYPE iinput_prompt_cpu_seconds histogram']
+    attempts = ['# HELP iinput_prompt_attempts_total Inputs read, including rejected ones.',
+                '# TYPE iinput_prompt_attempts_total counter']
+    outcomes = ['# HELP iinput_prompt_outcomes_total Prompt calls by outcome.',
+                '# TYPE iinput_prompt_outcomes_total counter']
+    for (method, prompt), s in sorted(series.items()):
+        labels = f'method="{_label(method)}",prompt="{_label(prompt)}"'
+        wait.extend(_histogram_lines('iinput_prompt_wait_seconds', histogram.buckets, labels, s['wait'], s['wait_sum'], s['count']))
+        cpu.extend(_histogram_lines('iinput_prompt_cpu_seconds', histogram.buckets, labels, s['cpu'], s['cpu_sum'], s['count']))
+        attempts.append(f'iinput_prompt_attempts_total{{{labels}}} {s["attempts"]}')
+        for outcome, count in sorted(s['outcomes'].items()):
+            outcomes.append(f'iinput_prompt_outcomes_total{{{labels},outcome="{outcome}"}} {count}')
+    return '\n'.join(wait + cpu + attempts + outcomes) + '\n'
+
+
+class PrometheusTextfile:
+
+
+    def __init__(self, path: str, interval: float = 10.0, histogram: Optional[Histogram] = None):
+        self.path = path
+        self.interval = interval
+        self.histogram = histogram or Histogram()
+        self.written = 0.0
+
+
+    def __call__(self, record: PromptRecord) -> None:
+        self.histogram(record)
+        if time.monotonic() - self.written >= self.interval:
+            self.write()
+
+
+    def write(self) -> None:
+        self.written = time.monotonic()
+        temporary = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, 'w') as f:
+            f.write(prometheus_text(self.histogram))
+        os.replace(temporary, self.path)
+
+
+def enable(*sinks: Callable[[PromptRecord], None]) -> None:
+    from iinput import iinput
+    iinput.set_metrics(*sinks)
+
+
+def disable() -> None:
+    from iinput import iinput
+    iinput.set_metrics()
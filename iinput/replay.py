@@ -0,0 +1,101 @@
+import json
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from iinput.sources import InputSource
+
+
+
+def prompt_key(prompt: str, rendered: bool = False) -> str:
+    key = prompt.strip()
+    if rendered and key.endswith(')'):
+        # format_prompt puts the default in parentheses after the ':' or '>'
+        end = max(key.rfind(': ('), key.rfind('> ('))
+        if end >= 0:
+            key = key[:end + 1]
+    if key[-1:] in (':', '>'):
+        key = key[:-1].rstrip()
+    if key.endswith(' [y/n]'):
+        key = key[:-6]
+    return key
+
+
+def _answer(value):
+    if value is None:
+        return ''
+    elif isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+class ReplayReport:
+
+
+    def __init__(self, missing: List[str], unused: Dict[Optional[str], List[str]]):
+        self.missing = missing
+        self.unused = unused
+
+
+    def __bool__(self) -> bool:
+        return not self.missing and not self.unused
+
+
+    def __repr__(self) -> str:
+        return f"ReplayReport(missing={self.missing!r}, unused={self.unused!r})"
+
+
+class ReplaySource(InputSource):
+
+
+    def __init__(self, script: Union[Dict[str, Any], Iterable[Any]]):
+        self.keyed = {}
+        self.ordered = deque()
+        self.missing = []
+        self.lock = threading.Lock()
+        if isinstance(script, dict):
+            script = ({'prompt': prompt, 'answer': answer} for prompt, answer in script.items())
+        for entry in script:
+            if isinstance(entry, dict) and 'answer' in entry:
+                self.add(entry['answer'], entry.get('prompt'))
+            else:
+                self.add(entry)
+
+
+    def add(self, answer: Any, prompt: Optional[str] = None) -> None:
+        answers = answer if isinstance(answer, list) and prompt is not None else [answer]
+        if prompt is None:
+            self.ordered.extend(map(_answer, answers))
+        else:
+            self.keyed.setdefault(prompt_key(prompt), deque()).extend(map(_answer, answers))
+
+
+    @classmethod
+    def load(cls, path: str) -> 'ReplaySource':
+        with open(path, encoding='utf-8') as f:
+            if path.endswith(('.jsonl', '.ndjson')):
+                return cls(json.loads(line) for line in f if line.strip())
+            elif path.endswith(('.yaml', '.yml')):
+                import yaml
+                return cls(yaml.safe_load(f) or [])
+            return cls(json.load(f))
+
+
+    def readline(self, prompt: str = '', timeout: Optional[float] = None) -> str:
+        key = prompt_key(prompt, rendered=True)
+        with self.lock:
+            answers = self.keyed.get(key)
+            if answers:
+                return answers.popleft()
+            elif self.ordered:
+                return self.ordered.popleft()
+            self.missing.append(key)
+        raise EOFError(f"no scripted answer for {key!r}")
+
+
+    def report(self) -> ReplayReport:
+        with self.lock:
+            unused = {key: list(answers) for key, answers in self.keyed.items() if answers}
+            if self.ordered:
+                unused[None] = list(self.ordered)
+            return ReplayReport(list(self.missing), unused)
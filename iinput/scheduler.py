@@ -0,0 +1,136 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+from iinput import sources
+
+
+
+_local = threading.local()
+
+
+@contextmanager
+def priority(level: int):
+    previous = getattr(_local, 'priority', 0)
+    _local.priority = level
+    try:
+        yield level
+    finally:
+        _local.priority = previous
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(map(_freeze, value))
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(map(_freeze, value))
+    elif isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    return value
+
+
+def _key(method, args, kwargs, source):
+    key = (method, _freeze(args), _freeze(kwargs), id(source))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class _Job:
+
+
+    def __init__(self, method, args, kwargs, source, key):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.source = source
+        self.key = key
+        self.futures = []
+        self.started = False
+
+
+    def run(self):
+        try:
+            with sources.using(self.source):
+                result = self.method(*self.args, **self.kwargs)
+        except BaseException as e:
+            for future in self.futures:
+                future.set_exception(e)
+        else:
+            for future in self.futures:
+                future.set_result(result)
+
+
+class PromptScheduler:
+
+
+    def __init__(self):
+        self.queue = queue.PriorityQueue()
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.sequence = itertools.count()
+        self.thread = None
+
+
+    def submit(self, method: Callable, *args, priority: Optional[int] = None, coalesce: bool = True, **kwargs) -> Future:
+        if priority is None:
+            priority = getattr(_local, 'priority', 0)
+        future = Future()
+        source = sources.get_source()
+        key = _key(method, args, kwargs, source) if coalesce else None
+        with self.lock:
+            job = self.pending.get(key) if key is not None else None
+            if job is None:
+                job = _Job(method, args, kwargs, source, key)
+                if key is not None:
+                    self.pending[key] = job
+            job.futures.append(future)
+            self.queue.put((priority, next(self.sequence), job))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._dispatch, name='iinput-prompts', daemon=True)
+                self.thread.start()
+        return future
+
+
+    def ask(self, method: Callable, *args, **kwargs) -> Any:
+        return self.submit(method, *args, **kwargs).result()
+
+
+    def _dispatch(self):
+        while True:
+            _, _, job = self.queue.get()
+            if job is None:
+                return
+            with self.lock:
+                if job.started:
+                    continue
+                job.started = True
+                if job.key is not None:
+                    del self.pending[job.key]
+            job.run()
+
+
+    def shutdown(self) -> None:
+        with self.lock:
+            thread, self.thread = self.thread, None
+            if thread is not None:
+                self.queue.put((float('inf'), next(self.sequence), None))
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+
+    def __enter__(self):
+        from iinput import iinput
+        iinput.set_scheduler(self)
+        return self
+
+
+    def __exit__(self, *exc_info):
+        from iinput import iinput
+        iinput.set_scheduler(None)
+        self.shutdown()
@@ -0,0 +1,373 @@
+import abc
+import os
+import stat
+import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+from iinput import terminal, utils
+
+
+
+class PromptTimeout(TimeoutError):
+    pass
+
+
+class InputSource(abc.ABC):
+
+    interactive = False
+
+
+    @abc.abstractmethod
+    def readline(self, prompt: str = '', timeout: Optional[float] = None) -> str:
+        pass
+
+
+    def getpass(self, prompt: str = '', timeout: Optional[float] = None) -> str:
+        return self.readline(prompt, timeout)
+
+
+    def iter_lines(self, chunk_size: int = 1 << 16, max_chars: int = -1, max_lines: int = -1) -> Iterator[str]:
+        count = chars = 0
+        while max_lines < 0 or count < max_lines:
+            timeout = remaining()
+            try:
+                line = self.readline() if timeout is None else self.readline('', timeout)
+            except EOFError:
+                return
+            chars += len(line) + 1
+            if 0 <= max_chars < chars:
+                return
+            yield line
+            count += 1
+
+
+class TTYSource(InputSource):
+
+    interactive = True
+
+
+    def readline(self, prompt: str = '', timeout: Optional[float] = None) -> str:
+        reader = stream_reader(sys.stdin)
+        if reader is not None and reader.pending:
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+            return reader.readline(timeout)
+        if timeout is not None:
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+            if not terminal.wait_readable(sys.stdin, timeout):
+                sys.stdout.write('\n')
+                raise PromptTimeout
+            prompt = ''
+        return input(prompt)
+
+
+    def getpass(self, prompt: str = '', timeout: Optional[float] = None) -> str:
+        if timeout is None or not terminal.is_terminal() or terminal.termios is None:
+            import getpass
+            return getpass.getpass(prompt=prompt)
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        with terminal.noecho(sys.stdin.fileno()):
+            line = sys.stdin.readline() if terminal.wait_readable(sys.stdin, timeout) else None
+        sys.stdout.write('\n')
+        if line is None:
+            raise PromptTimeout
+        elif not line:
+            raise EOFError
+        return line[:-1] if line[-1] == '\n' else line
+
+
+    def iter_lines(self, chunk_size: int = 1 << 16, max_chars: int = -1, max_lines: int = -1) -> Iterator[str]:
+        return utils.iter_chunked_lines(sys.stdin, chunk_size, max_chars, max_lines)
+
+
+class _StreamReader:
+
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.fd = stream.fileno()
+        self.pending = ''
+
+
+    def _nonblocking(self, read):
+        # everything goes through the stream's own text layer, so lines it has already buffered are never
+        # skipped and direct sys.stdin reads keep working; only the descriptor is briefly made non-blocking
+        blocking = os.get_blocking(self.fd)
+        os.set_blocking(self.fd, False)
+        try:
+            return read()
+        finally:
+            os.set_blocking(self.fd, blocking)
+
+
+    def poll(self, readable: bool = False) -> Optional[str]:
+        # a complete line, '' at the end of input, or None while the rest of the line has not arrived
+        chunk = self._nonblocking(self.stream.readline)
+        if chunk:
+            self.pending += chunk
+            if chunk[-1] != '\n':
+                return None
+        elif not readable:
+            return None
+        line, self.pending = self.pending, ''
+        return line
+
+
+    def readline(self, timeout: Optional[float] = None) -> str:
+        if timeout is None:
+            line, self.pending = self.pending + self.stream.readline(), ''
+        else:
+            end = time.monotonic() + timeout
+            line = self.poll()
+            while line is None:
+                if not terminal.wait_readable(self.stream, max(0.0, end - time.monotonic())):
+                    raise PromptTimeout
+                line = self.poll(True)
+        return self.finish(line)
+
+
+    @staticmethod
+    def finish(line: str) -> str:
+        if not line:
+            raise EOFError
+        line = line[:-1] if line[-1] == '\n' else line
+        return line[:-1] if line[-1:] == '\r' else line
+
+
+    def read_char(self, timeout: Optional[float] = None) -> Optional[str]:
+        if self.pending:
+            char, self.pending = self.pending[0], self.pending[1:]
+            return char
+        if timeout is None:
+            return self.stream.read(1)
+        char = self._nonblocking(lambda: self.stream.read(1))
+        if char or not terminal.wait_readable(self.stream, timeout):
+            return char or None
+        return self._nonblocking(lambda: self.stream.read(1))
+
+
+def _pollable(stream):
+    try:
+        return not stat.S_ISREG(os.fstat(stream.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+_readers = weakref.WeakKeyDictionary()
+_readers_lock = threading.Lock()
+
+
+def stream_reader(stream) -> Optional[_StreamReader]:
+    # one reader per pipe or terminal, so a partial line picked up by a timed, key or asyncio read is
+    # handed to whichever read comes next
+    with _readers_lock:
+        try:
+            reader = _readers.get(stream)
+        except TypeError:
+            return None
+        if reader is None:
+            reader = _readers[stream] = _StreamReader(stream) if _pollable(stream) else False
+        return reader or None
+
+
+def read_char(stream, timeout: Optional[float] = None) -> Optional[str]:
+    reader = stream_reader(stream)
+    if reader is not None:
+        return reader.read_char(timeout)
+    return stream.read(1) if terminal.wait_readable(stream, timeout) else None
+
+
+class PipeSource(InputSource):
+
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+
+    def readline(self, prompt: str = '', timeout: Optional[float] = None) -> str:
+        stream = self.stream or sys.stdin
+        reader = stream_reader(stream)
+        if reader is not None:
+            return reader.readline(timeout)
+        line = stream.readline()
+        if not line:
+            raise EOFError
+        return line[:-1] if line[-1] == '\n' else line
+
+
+    def iter_lines(self, chunk_size: int = 1 << 16, max_chars: int = -1, max_lines: int = -1) -> Iterator[str]:
+        stream = self.stream or sys.stdin
+        reader = stream_reader(stream)
+        if reader is not None and (reader.pending or remaining() is not None):
+            return super().iter_lines(chunk_size, max_chars, max_lines)
+        return utils.iter_chunked_lines(stream, chunk_size, max_chars, max_lines)
+
+
+class FileSource(PipeSource):
+
+
+    def __init__(self, path: str, encoding: str = 'utf-8'):
+        super().__init__(open(path, encoding=encoding))
+
+
+    def close(self) -> None:
+        self.stream.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ListSource(InputSource):
+
+
+    def __init__(self, answers: Iterable[str]):
+        self.answers = iter(answers)
+        self.lock = threading.Lock()
+
+
+    def readline(self, prompt: str = '', timeout: Optional[float] = None) -> str:
+        with self.lock:
+            for answer in self.answers:
+                return str(answer)
+        raise EOFError
+
+
+_global_source = None
+_global_timeout = float(os.environ['IINPUT_TIMEOUT']) if os.environ.get('IINPUT_TIMEOUT') else None
+_local = threading.local()
+_auto = (None, None)
+
+
+def auto_source() -> InputSource:
+    global _auto
+    stdin, source = _auto
+    if stdin is not sys.stdin:
+        stdin = sys.stdin
+        source = TTYSource() if stdin is None or stdin.isatty() else PipeSource()
+        _auto = (stdin, source)
+    return source
+
+
+def get_source() -> InputSource:
+    return getattr(_local, 'source', None) or _global_source or auto_source()
+
+
+def set_source(source: InputSource = None) -> None:
+    global _global_source
+    _global_source = source
+
+
+@contextmanager
+def using(source: InputSource):
+    previous = getattr(_local, 'source', None)
+    _local.source = source
+    try:
+        yield source
+    finally:
+        _local.source = previous
+
+
+def reads_stdin(source: InputSource) -> bool:
+    return isinstance(source, TTYSource) or (type(source) is PipeSource and source.stream is None)
+
+
+def set_timeout(seconds: Optional[float] = None) -> None:
+    global _global_timeout
+    _global_timeout = seconds
+
+
+def get_timeout() -> Optional[float]:
+    return _global_timeout
+
+
+def deadline_for(timeout: Optional[float] = None, deadline: Optional[float] = None) -> Optional[float]:
+    now = time.monotonic()
+    ends = [end for end in (deadline,
+                            None if timeout is None else now + timeout,
+                            None if _global_timeout is None else now + _global_timeout) if end is not None]
+    return min(ends) if ends else None
+
+
+@contextmanager
+def deadline(end: Optional[float], expire_empty: bool = False):
+    previous = getattr(_local, 'deadline', None), getattr(_local, 'expire_empty', False)
+    if end is not None and previous[0] is not None:
+        end = min(end, previous[0])
+    _local.deadline, _local.expire_empty = end, expire_empty
+    try:
+        yield end
+    finally:
+        _local.deadline, _local.expire_empty = previous
+
+
+def remaining() -> Optional[float]:
+    end = getattr(_local, 'deadline', None)
+    if end is None:
+        return _global_timeout
+    return max(0.0, end - time.monotonic())
+
+
+@contextmanager
+def recording(record):
+    previous = getattr(_local, 'record', None)
+    _local.record = record
+    try:
+        yield record
+    finally:
+        _local.record = previous
+
+
+def blocking(function, *args, **kwargs):
+    record = getattr(_local, 'record', None)
+    if record is None:
+        return function(*args, **kwargs)
+    start = time.perf_counter()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        record.wait += time.perf_counter() - start
+        record.attempts += 1
+
+
+def pop_expired() -> bool:
+    expired = getattr(_local, 'expired', False)
+    _local.expired = False
+    return expired
+
+
+def _read(prompt, secret):
+    source = get_source()
+    read = source.getpass if secret else source.readline
+    timeout = remaining()
+    if timeout is None:
+        return read(prompt)
+    try:
+        return read(prompt, timeout)
+    except PromptTimeout:
+        if getattr(_local, 'expire_empty', False):
+            _local.expired = True
+            record = getattr(_local, 'record', None)
+            if record is not None:
+                record.expired = True
+            return ''
+        raise
+
+
+def read(prompt: str = '', secret: bool = False) -> str:
+    record = getattr(_local, 'record', None)
+    if record is None:
+        return _read(prompt, secret)
+    line = blocking(_read, prompt, secret)
+    record.blank = not str(line).strip()
+    return line
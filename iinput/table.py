@@ -0,0 +1,189 @@
+import array
+from typing import Any, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Union
+
+from iinput import converters, utils, validators
+
+
+
+TYPECODES = {int: 'q', float: 'd'}
+
+
+def _float(s):
+    return float(validators.number(s))
+
+
+def _string(s):
+    return s.strip()
+
+
+CONVERTERS = {int: validators.integer, float: _float, bool: validators.boolean, str: _string}
+
+
+def _registered(t):
+    try:
+        order = converters.dispatch([t])
+    except TypeError:
+        raise ValueError(f"unsupported column type {t!r}") from None
+
+    def convert(s):
+        return converters.convert(s.strip(), order)
+    return convert
+
+
+class BoolColumn(Sequence):
+
+
+    def __init__(self, values: Iterable[bool] = ()):
+        self.data = array.array('b', values)
+
+
+    def append(self, value: bool) -> None:
+        self.data.append(value)
+
+
+    def pop(self) -> bool:
+        return bool(self.data.pop())
+
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return BoolColumn(self.data[i])
+        return bool(self.data[i])
+
+
+    def __iter__(self) -> Iterator[bool]:
+        return map(bool, self.data)
+
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BoolColumn):
+            return self.data == other.data
+        return NotImplemented
+
+
+    def __repr__(self) -> str:
+        return f"BoolColumn({list(self)!r})"
+
+
+def _column(t):
+    if t is bool:
+        return BoolColumn()
+    return array.array(TYPECODES[t]) if t in TYPECODES else []
+
+
+class CellError(NamedTuple):
+    row: int
+    column: Optional[str]
+    value: str
+    message: str
+
+
+    def __str__(self) -> str:
+        where = f"row {self.row}" if self.column is None else f"row {self.row}, column '{self.column}'"
+        return f"{where}: {self.message}"
+
+
+class Table(Mapping):
+
+
+    def __init__(self, columns: Sequence[str], types: Union[type, Sequence[type]] = str):
+        types = list(types) if isinstance(types, (list, tuple)) else [types] * len(columns)
+        if len(types) != len(columns):
+            raise ValueError(f"expected {len(columns)} types, got {len(types)}")
+        self.names = list(columns)
+        self.types = types
+        self.columns = {name: _column(t) for name, t in zip(self.names, types)}
+        self.errors = []
+        self.rows = 0
+        self.last_row = 0
+        self.read_only = False
+        self._storage = [column.data if isinstance(column, BoolColumn) else column for column in self.columns.values()]
+        self._converters = [CONVERTERS.get(t) or _registered(t) for t in types]
+
+
+    def append(self, line: str, delimiter: str = ',', row: Optional[int] = None) -> bool:
+        if self.read_only:
+            raise TypeError("a to_numpy() table is read-only")
+        row = self.last_row + 1 if row is None else row
+        self.last_row = row
+        cells = line.split(delimiter)
+        if len(cells) != len(self.names):
+            self.errors.append(CellError(row, None, line, f"expected {len(self.names)} cells, got {len(cells)}"))
+            return False
+        values = []
+        failed = False
+        for name, convert, cell in zip(self.names, self._converters, cells):
+            try:
+                values.append(convert(cell))
+            except ValueError as e:
+                self.errors.append(CellError(row, name, cell, str(e)))
+                failed = True
+        if failed:
+            return False
+        storage = self._storage
+        for i, value in enumerate(values):
+            try:
+                storage[i].append(value)
+            except OverflowError:
+                for undo in storage[:i]:
+                    undo.pop()
+                self.errors.append(CellError(row, self.names[i], cells[i], "out of range"))
+                return False
+        self.rows += 1
+        return True
+
+
+    def extend(self, lines: Iterable[str], delimiter: str = ',') -> 'Table':
+        for row, line in enumerate(lines, self.last_row + 1):
+            if line.strip():
+                self.append(line, delimiter, row)
+            self.last_row = row
+        return self
+
+
+    def to_numpy(self) -> 'Table':
+        np = utils._numpy()
+        if np is None:
+            raise ImportError("to_numpy() needs numpy")
+        table = Table.__new__(Table)
+        table.__dict__.update(self.__dict__)
+        table.columns = {}
+        for name, column in self.columns.items():
+            if isinstance(column, BoolColumn):
+                column = np.frombuffer(column.data, dtype=np.int8).astype(np.bool_)
+            elif isinstance(column, array.array):
+                column = np.array(column, dtype=np.int64 if column.typecode == 'q' else np.float64)
+            else:
+                column = list(column)
+            table.columns[name] = column
+        table.errors = list(self.errors)
+        table.read_only = True
+        return table
+
+
+    def row(self, i: int) -> List[Any]:
+        return [self.columns[name][i] for name in self.names]
+
+
+    def __getitem__(self, name: str) -> Any:
+        return self.columns[name]
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+    def __bool__(self) -> bool:
+        return not self.errors
+
+
+    def __repr__(self) -> str:
+        return f"Table({self.rows} rows x {len(self.names)} columns, {len(self.errors)} errors)"
@@ -0,0 +1,138 @@
+import os
+import select
+import sys
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = tty = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+
+ESC = '\x1b'
+
+
+@contextmanager
+def cbreak(fd: int):
+    attributes = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd, termios.TCSANOW)
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, attributes)
+
+
+@contextmanager
+def noecho(fd: int):
+    attributes = termios.tcgetattr(fd)
+    try:
+        quiet = list(attributes)
+        quiet[3] &= ~termios.ECHO
+        termios.tcsetattr(fd, termios.TCSANOW, quiet)
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, attributes)
+
+
+def wait_readable(stream, timeout: Optional[float]) -> bool:
+    if timeout is None:
+        return True
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return True
+    try:
+        return bool(select.select([fd], [], [], timeout)[0])
+    except (OSError, ValueError):
+        return True
+
+
+def _utf8_length(lead):
+    if lead >= 0xf0:
+        return 4
+    elif lead >= 0xe0:
+        return 3
+    elif lead >= 0xc0:
+        return 2
+    return 1
+
+
+def _read_char(fd):
+    data = os.read(fd, 1)
+    if not data:
+        return ''
+    if data == ESC.encode():
+        while select.select([fd], [], [], 0)[0]:
+            chunk = os.read(fd, 1)
+            if not chunk:
+                break
+            data += chunk
+    else:
+        remaining = _utf8_length(data[0]) - 1
+        while remaining > 0:
+            chunk = os.read(fd, remaining)
+            if not chunk:
+                break
+            data += chunk
+            remaining -= len(chunk)
+    return data.decode('utf-8', 'replace')
+
+
+_probe = (None, False)
+
+
+def is_terminal(stream=None) -> bool:
+    global _probe
+    stream = stream or sys.stdin
+    probed, result = _probe
+    if stream is not probed:
+        try:
+            result = stream.isatty() and (termios is not None or msvcrt is not None)
+        except (AttributeError, ValueError):
+            result = False
+        _probe = (stream, result)
+    return result
+
+
+def _kbhit(timeout):
+    end = time.monotonic() + timeout
+    while not msvcrt.kbhit():
+        if time.monotonic() >= end:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def read_key(stream=None, timeout: Optional[float] = None) -> Optional[str]:
+    stream = stream or sys.stdin
+    if not is_terminal(stream):
+        from iinput import sources
+        return sources.read_char(stream, timeout)
+    if msvcrt is not None:
+        return msvcrt.getwch() if timeout is None or _kbhit(timeout) else None
+    fd = stream.fileno()
+    with cbreak(fd):
+        if not wait_readable(stream, timeout):
+            return None
+        return _read_char(fd)
+
+
+def wait_for_key(keys, stream=None, timeout: Optional[float] = None) -> Optional[str]:
+    end = None if timeout is None else time.monotonic() + timeout
+    key = None
+    while key not in keys:
+        key = read_key(stream, None if end is None else max(0.0, end - time.monotonic()))
+        if key is None:
+            return None
+        elif not key:
+            raise EOFError
+    return key
@@ -1,3 +1,70 @@
+import array
+import codecs
+import functools
+import io
+import math
+import mmap
+import os
+import re
+import stat
+import warnings
+from collections import Counter
+
+
+PATTERN_CACHE_SIZE = 256
+
+EMAIL = re.compile(
+    r"[\w!#$%&'*+/=?^`{|}~-]+(?:\.[\w!#$%&'*+/=?^`{|}~-]+)*"
+    r"@(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+[A-Za-z]{2,63}")
+
+_compile = functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)(re.compile)
+
+
+def compile_pattern(pattern, flags=0):
+    if isinstance(pattern, re.Pattern):
+        if flags:
+            raise ValueError("cannot process flags argument with a compiled pattern")
+        return pattern
+    return _compile(pattern, flags)
+
+
+def pattern_cache_info():
+    return _compile.cache_info()
+
+
+_NUMERIC_START = frozenset('+-.0123456789')
+_FLOAT_START = frozenset('.0123456789')
+
+
+BUILTIN_TYPES = frozenset([bool, int, float, str, None])
+
+
+def classify(s):
+    s = s.strip()
+    if not s.isascii():
+        return str, s
+    if s.isdigit() and len(s) < 4300:
+        return int, int(s)
+    if not s:
+        return None, None
+    c = s[0]
+    if c in _NUMERIC_START:
+        if '_' not in s:
+            body = s[1:] if c in '+-' else s
+            try:
+                if body.isdigit():
+                    return int, int(s)
+                if body and body[0] in _FLOAT_START:
+                    return float, float(s)
+            except ValueError:
+                pass
+    elif s == 'None':
+        return None, None
+    elif len(s) < 6:
+        lower = s.lower()
+        if lower == 'true' or lower == 'false':
+            return bool, lower == 'true'
+    return str, s
 
 
 def isfloat(s):
@@ -19,39 +86,271 @@ def ischar(v):
 
 
 def interpret_type(s):
-    s = s.strip()
-    if s.lower() in ["true", "false"]:
-        return bool
-    elif isint(s):
-        return int
-    elif isfloat(s):
-        return float
-    elif s == "None":
-        return None
-    elif s:
-        return str 
-    else:
-        return None
+    return classify(s)[0]
 
 
-def auto_cast(items, allowed_types):
-    for i in range(len(items)):
-        items[i] = items[i].strip()
-        item_type = interpret_type(items[i])
-        if item_type not in allowed_types:
-            if items[i] in ['0', '1'] and bool in allowed_types:
-                items[i] = items[i] == '1'
-            elif items[i] and str in allowed_types:
-                items[i] = str(items[i])
+def iter_cast(items, allowed_types):
+    allowed_types = set(allowed_types)
+    if allowed_types == {str}:
+        for item in items:
+            yield item.strip() or None
+        return
+    extras = ()
+    if not allowed_types <= BUILTIN_TYPES:
+        from iinput import converters
+        extras = converters.dispatch(allowed_types)
+    bool_allowed = bool in allowed_types
+    str_allowed = str in allowed_types
+    for item in items:
+        item_type, value = classify(item)
+        if item_type in allowed_types and (item_type is not str or not extras):
+            yield value
+            continue
+        if extras:
+            s = value if item_type is str else item.strip()
+            if s:
+                try:
+                    yield converters.convert(s, extras)
+                    continue
+                except ValueError:
+                    pass
+        if bool_allowed or str_allowed:
+            item = item.strip()
+            if item in ['0', '1'] and bool_allowed:
+                yield item == '1'
+            elif item and str_allowed:
+                yield item
             else:
-                items[i] = None
-        elif item_type == bool:
-            items[i] = items[i].lower() == "true"
+                yield None
         else:
-            items[i] = item_type(items[i])
+            yield None
+
+
+def auto_cast(items, allowed_types):
+    items[:] = iter_cast(items, allowed_types)
     return items
 
 
 def split_ws(string, delimiter):
-    values = [v.strip() for v in string.split(delimiter) if v.strip()]
+    return [v for v in map(str.strip, string.split(delimiter)) if v]
+
+
+def iter_split_ws(string, delimiter):
+    if not delimiter:
+        raise ValueError("empty separator")
+    start = 0
+    step = len(delimiter)
+    while start <= len(string):
+        end = string.find(delimiter, start)
+        if end < 0:
+            end = len(string)
+        value = string[start:end].strip()
+        if value:
+            yield value
+        start = end + step
+
+
+class MatchResult:
+
+
+    def __init__(self, matched, missing=(), extra=(), attempts=0):
+        self.matched = matched
+        self.missing = list(missing)
+        self.extra = list(extra)
+        self.attempts = attempts
+
+
+    def __bool__(self):
+        return self.matched
+
+
+    def __repr__(self):
+        return f"MatchResult(matched={self.matched}, missing={self.missing}, extra={self.extra}, attempts={self.attempts})"
+
+
+def target_set(targets, multiset=True):
+    values = (str(v) for v in targets)
+    return Counter(values) if multiset else frozenset(values)
+
+
+def compare_values(targets, values):
+    if isinstance(targets, Counter):
+        values = Counter(values)
+        return list((targets - values).elements()), list((values - targets).elements())
+    values = set(values)
+    return [v for v in targets if v not in values], [v for v in values if v not in targets]
+
+
+_NUMERIC_BYTES = b'0123456789+-.eE'
+_FLOAT_MARKS = b'.eE'
+_LONG_DIGITS = re.compile(rb'\d{16}')
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _has_int_fields(np, data, delimiter):
+    codes = np.frombuffer(data, dtype=np.uint8)
+    separators = delimiter.encode('ascii')
+    if len(separators) == 1:
+        is_sep = codes == separators[0]
+    else:
+        is_sep = np.isin(codes, np.frombuffer(separators, dtype=np.uint8))
+    fields = np.cumsum(is_sep, dtype=np.int64)
+    has_digit = np.zeros(int(fields[-1]) + 1, dtype=bool)
+    has_mark = np.zeros_like(has_digit)
+    has_digit[fields[(codes - ord('0')) < 10]] = True
+    has_mark[fields[(codes == ord('.')) | ((codes | 0x20) == ord('e'))]] = True
+    return bool((has_digit & ~has_mark).any())
+
+
+def _has_bare_signs(np, data):
+    # NumPy reads a sign with no digits after it as 0, or joins it to the number after some whitespace
+    codes = np.frombuffer(data, dtype=np.uint8)
+    for sign in b'+-':
+        if data[-1] == sign:
+            return True
+        if bytes((sign,)) in data:
+            after = codes[np.flatnonzero(codes[:-1] == sign) + 1]
+            if not (((after - ord('0')) < 10) | (after == ord('.'))).all():
+                return True
+    return False
+
+
+def _bulk_numpy(np, string, data, delimiter, allowed_types):
+    int_allowed = int in allowed_types
+    dtype = np.float64 if any(c in data for c in _FLOAT_MARKS) else np.int64
+    if dtype is np.int64 and not int_allowed:
+        return None
+    if dtype is np.float64 and float not in allowed_types:
+        return None
+    if dtype is np.float64 and not int_allowed and _has_int_fields(np, data, delimiter):
+        return None
+    if dtype is np.float64 and int_allowed and _LONG_DIGITS.search(data):
+        # float64 would round an integer field above 2**53
+        return None
+    if _has_bare_signs(np, data):
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        try:
+            values = np.fromstring(string, dtype=dtype, sep=delimiter)
+        except (ValueError, DeprecationWarning):
+            return None
+    if dtype is np.int64:
+        info = np.iinfo(np.int64)
+        if values.size and (values.max() == info.max or values.min() == info.min):
+            return None
+    elif not np.isfinite(values).all():
+        return None
     return values
+
+
+def _bulk_array(string, delimiter, allowed_types):
+    values = []
+    for item in split_ws(string, delimiter):
+        item_type, value = classify(item)
+        if item_type not in allowed_types or item_type not in [int, float]:
+            return None
+        values.append(value)
+    typecode = 'd' if any(type(v) is float for v in values) else 'q'
+    if typecode == 'd' and any(abs(v) > 1 << 53 if type(v) is int else not math.isfinite(v) for v in values):
+        return None
+    try:
+        return array.array(typecode, values)
+    except OverflowError:
+        return None
+
+
+def bulk_cast(string, delimiter, allowed_types):
+    string = string.strip()
+    if not string or not (int in allowed_types or float in allowed_types):
+        return None
+    try:
+        data = string.encode('ascii')
+        separators = delimiter.encode('ascii')
+    except UnicodeEncodeError:
+        return None
+    if not separators or separators.translate(None, _NUMERIC_BYTES) != separators:
+        return None
+    # NumPy reads any whitespace in sep as "any run of whitespace", which split_ws does not
+    if delimiter.isspace() and delimiter != ' ':
+        return None
+    whitespace = b' ' if delimiter == ' ' else b' \t\r\n\v\f'
+    if data.translate(None, _NUMERIC_BYTES + separators + whitespace):
+        return None
+    np = _numpy()
+    if np is None:
+        return _bulk_array(string, delimiter, allowed_types)
+    return _bulk_numpy(np, string, data, delimiter, allowed_types)
+
+
+def _mapped_chunks(stream, chunk_size):
+    try:
+        st = os.fstat(stream.fileno())
+        if not stat.S_ISREG(st.st_mode) or not st.st_size:
+            return None
+        start = stream.tell()
+        mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+
+    def chunks():
+        encoding = getattr(stream, 'encoding', None) or 'utf-8'
+        decoder = codecs.getincrementaldecoder(encoding)(getattr(stream, 'errors', None) or 'strict')
+        position = start
+        try:
+            while position < len(mapped):
+                end = mapped.rfind(b'\n', position, position + chunk_size) + 1
+                if not end:
+                    end = mapped.find(b'\n', position + chunk_size) + 1 or len(mapped)
+                chunk = mapped[position:end]
+                position += len(chunk)
+                yield decoder.decode(chunk, final=position >= len(mapped)).replace('\r\n', '\n')
+        finally:
+            mapped.close()
+            stream.seek(position)
+
+    return chunks()
+
+
+def _read_chunks(stream, chunk_size):
+    while True:
+        chunk = stream.read(chunk_size)
+        if chunk:
+            yield chunk
+        if len(chunk) < chunk_size:
+            return
+
+
+def iter_chunked_lines(stream, chunk_size=1 << 16, max_chars=-1, max_lines=-1):
+    chunks = _mapped_chunks(stream, chunk_size) or _read_chunks(stream, chunk_size)
+    pending = ''
+    count = 0
+    consumed = 0
+    truncated = False
+    try:
+        for chunk in chunks:
+            if 0 <= max_chars < consumed + len(chunk):
+                chunk = chunk[:max_chars - consumed]
+            consumed += len(chunk)
+            lines = (pending + chunk).split('\n')
+            pending = lines.pop()
+            for line in lines:
+                if 0 <= max_lines <= count:
+                    return
+                yield line
+                count += 1
+            if consumed == max_chars:
+                # whatever follows the last newline may be the start of a longer line, so it is dropped
+                truncated = True
+                break
+        if pending and not truncated and not 0 <= max_lines <= count:
+            yield pending
+    finally:
+        chunks.close()
@@ -0,0 +1,127 @@
+from typing import Any, List, Match
+
+from iinput import utils
+
+
+
+def yn(s: str) -> str:
+    s = s.strip().lower()
+    if s not in ['y', 'n']:
+        raise ValueError("expected y or n")
+    return s
+
+
+def value(s: str, allowed_types: List[type] = [str]) -> Any:
+    v, = utils.auto_cast([s], allowed_types=allowed_types)
+    if v is None:
+        raise ValueError(f"expected one of {', '.join(getattr(t, '__name__', str(t)) for t in allowed_types)}")
+    return v
+
+
+def values(s: str, delimiter: str = ',', allowed_types: List[type] = [str]) -> list:
+    items = utils.auto_cast(utils.split_ws(s, delimiter), allowed_types)
+    if not items:
+        raise ValueError("expected at least one value")
+    return items
+
+
+def boolean(s: str) -> bool:
+    s = s.strip().lower()
+    if s in ['0', '1']:
+        return s == '1'
+    elif s in ['false', 'true']:
+        return s == 'true'
+    raise ValueError("expected true, false, 1 or 0")
+
+
+def number(s: str) -> int or float:
+    s_type, v = utils.classify(s)
+    if s_type not in [int, float]:
+        raise ValueError("expected a number")
+    return v
+
+
+def integer(s: str) -> int:
+    s_type, v = utils.classify(s)
+    if s_type is not int:
+        raise ValueError("expected an integer")
+    return v
+
+
+def floating_point(s: str) -> float:
+    s_type, v = utils.classify(s)
+    if s_type is not float:
+        raise ValueError("expected a floating point number")
+    return v
+
+
+def character(s: str) -> str:
+    if not utils.ischar(s):
+        raise ValueError("expected a single character")
+    return s
+
+
+def string(s: str) -> str:
+    s = s.strip()
+    if not s:
+        raise ValueError("expected a non-empty string")
+    return s
+
+
+def alpha(s: str) -> str:
+    s = s.strip()
+    if not s.isalpha():
+        raise ValueError("expected letters only")
+    return s
+
+
+def alphanumeric(s: str) -> str:
+    s = s.strip()
+    if not s.isalnum():
+        raise ValueError("expected letters and digits only")
+    return s
+
+
+def line(s: str) -> str:
+    if not s:
+        raise ValueError("expected a non-empty line")
+    return s
+
+
+def email(s: str) -> str:
+    match = utils.EMAIL.search(s.strip())
+    if not match:
+        raise ValueError("expected an email address")
+    return match.group(0)
+
+
+def password(s: str) -> str:
+    if not s:
+        raise ValueError("expected a non-empty password")
+    return s
+
+
+def regex(s: str, r, flags: int = 0) -> Match[str]:
+    match = utils.compile_pattern(r, flags).search(s)
+    if not match:
+        raise ValueError(f"expected input matching {getattr(r, 'pattern', r)!r}")
+    return match
+
+
+VALIDATORS = {
+    'yn': yn,
+    'value': value,
+    'values': values,
+    'boolean': boolean,
+    'number': number,
+    'integer': integer,
+    'floating_point': floating_point,
+    'character': character,
+    'string': string,
+    'alpha': alpha,
+    'alphanumeric': alphanumeric,
+    'line': line,
+    'email': email,
+    'password': password,
+    'regex': regex,
+}
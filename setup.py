@@ -5,6 +5,9 @@ setup(
   install_requires=[
     'keyboard',
   ],
+  extras_require={
+    'numpy': ['numpy'],
+  },
   version = '1.0.9',
   license='MIT',
   description = '',
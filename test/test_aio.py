@@ -0,0 +1,111 @@
+import sys; sys.path.append('..');
+import asyncio
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+from iinput import iinput, aio
+from iinput.sources import ListSource, PipeSource
+
+
+class AioTest(unittest.TestCase):
+
+
+    def test_list_source(self):
+        async def main():
+            with iinput.using(ListSource(['x', '7', '', 'y'])):
+                number = await iinput.ainteger(prompt='')
+                answer = await iinput.ayn(prompt='', default='d')
+            return number, answer
+
+        self.assertEqual(asyncio.run(main()), (7, 'd'))
+
+
+    def test_async_iterators(self):
+        async def main():
+            with iinput.using(ListSource(['1, x, 2.5', 'a', ' b ', 'c'])):
+                values = [v async for v in iinput.aiter_values(prompt='', allowed_types=[int, float])]
+                lines = [line async for line in iinput.aiter_lines(prompt='', max_lines=2)]
+                rest = await iinput.alines(prompt='')
+            return values, lines, rest
+
+        self.assertEqual(asyncio.run(main()), ([1, None, 2.5], ['a', ' b '], ['c']))
+
+
+    def test_stdin_reader(self):
+        read_fd, write_fd = os.pipe()
+        stdin = os.fdopen(read_fd, 'r')
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.001)
+
+        async def operator():
+            await asyncio.sleep(0.05)
+            os.write(write_fd, b'abc\n12\n')
+            await asyncio.sleep(0.05)
+            os.write(write_fd, b'n\n')
+            os.close(write_fd)
+
+        async def main():
+            background = asyncio.ensure_future(ticker())
+            typing = asyncio.ensure_future(operator())
+            first, second = await asyncio.gather(iinput.ainteger(prompt=''), iinput.ayn(prompt=''))
+            await typing
+            with self.assertRaises(EOFError):
+                await iinput.astring(prompt='', default=None)
+            background.cancel()
+            return first, second
+
+        with patch('sys.stdin', stdin), iinput.using(PipeSource()):
+            self.assertEqual(asyncio.run(main()), (12, 'n'))
+        stdin.close()
+        self.assertGreater(len(ticks), 10)
+
+
+    def test_executor_fallback(self):
+        async def main():
+            reader = aio.StdinReader(asyncio.get_running_loop(), io.StringIO('a\nb'))
+            return [await reader.readline(), await reader.readline()]
+
+        self.assertEqual(asyncio.run(main()), ['a', 'b'])
+
+
+    def test_mixed_sync_and_async(self):
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b'1\n2\n3\n4\n5\n')
+        os.close(write_fd)
+        stdin = os.fdopen(read_fd, 'r')
+
+        async def main():
+            return await iinput.ainteger(prompt='b'), await iinput.ainteger(prompt='c')
+
+        with patch('sys.stdin', stdin), iinput.using(PipeSource()):
+            self.assertEqual(iinput.integer(prompt='a'), 1)
+            self.assertEqual(asyncio.run(main()), (2, 3))
+            self.assertEqual(iinput.integer(prompt='d', timeout=1), 4)
+            self.assertEqual(asyncio.run(iinput.ainteger(prompt='e')), 5)
+        stdin.close()
+
+
+    def test_cancel(self):
+        read_fd, write_fd = os.pipe()
+        stdin = os.fdopen(read_fd, 'r')
+
+        async def main():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(iinput.astring(prompt=''), 0.05)
+            os.write(write_fd, b'later\n')
+            return await iinput.astring(prompt='')
+
+        with patch('sys.stdin', stdin), iinput.using(PipeSource()):
+            self.assertEqual(asyncio.run(main()), 'later')
+        os.close(write_fd)
+        stdin.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys; sys.path.append('..');
+import os
+import pickle
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from iinput import iinput, ListSource, Menu, PipeSource
+from iinput.cache import AnswerCache
+
+
+class CacheTest(unittest.TestCase):
+
+
+    def test_memoizes_by_method_and_arguments(self):
+        with AnswerCache(), iinput.using(ListSource(['prod', '2', 'dev', 'x'])):
+            for _ in range(3):
+                self.assertEqual(iinput.string('cluster'), 'prod')
+            self.assertEqual(iinput.selection(Menu({1: 'a', 2: 'b'})), ('2', 'b'))
+            self.assertEqual(iinput.selection(Menu({1: 'a', 2: 'b'})), ('2', 'b'))
+            self.assertEqual(iinput.string('other cluster'), 'dev')
+            self.assertTrue(iinput.match_value('confirm', 'x'))
+
+
+    def test_ttl_and_lru(self):
+        with patch('iinput.cache.time.time', return_value=100.0) as clock:
+            with AnswerCache(ttl=10, maxsize=2), iinput.using(ListSource(['a', 'b', 'c', 'a2', 'a3'])):
+                self.assertEqual(iinput.string('1'), 'a')
+                self.assertEqual(iinput.string('2'), 'b')
+                self.assertEqual(iinput.string('3'), 'c')
+                self.assertEqual(iinput.string('1'), 'a2')
+                clock.return_value = 111.0
+                self.assertEqual(iinput.string('1'), 'a3')
+
+
+    def test_persistent_store_and_secrets(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'answers.db')
+            with AnswerCache(path=path), iinput.using(ListSource(['prod', 'hunter2', 'hunter3'])):
+                self.assertEqual(iinput.string('cluster'), 'prod')
+                self.assertEqual(iinput.password('pwd'), 'hunter2')
+                self.assertEqual(iinput.password('pwd'), 'hunter3')
+            with AnswerCache(path=path, secrets=True), iinput.using(ListSource(['s1', 's2'])):
+                self.assertEqual(iinput.string('cluster'), 'prod')
+                self.assertEqual(iinput.password('pwd'), 's1')
+                self.assertEqual(iinput.password('pwd'), 's1')
+            with sqlite3.connect(path) as db:
+                stored = [row[0] for row in db.execute("SELECT value FROM answers")]
+            self.assertEqual(stored, ['[false, "prod"]'])
+
+
+    def test_persists_json_only(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'answers.db')
+            with AnswerCache(path=path), iinput.using(ListSource(['1', 'id-7'])):
+                self.assertEqual(iinput.selection({1: 'a'}), ('1', 'a'))
+                self.assertEqual(iinput.regex('id', r'id-\d').group(0), 'id-7')
+                self.assertEqual(iinput.regex('id', r'id-\d').group(0), 'id-7')
+            with sqlite3.connect(path) as db:
+                db.execute("UPDATE answers SET value = ?", (pickle.dumps(os.getcwd),))
+                db.execute("INSERT INTO answers VALUES ('x', ?, 1e12, 1e12)", ('[false, "x"]',))
+            with AnswerCache(path=path) as cache, iinput.using(ListSource(['1', 'id-8'])):
+                self.assertEqual(iinput.selection({1: 'a'}), ('1', 'a'))
+                self.assertEqual(iinput.regex('id', r'id-\d').group(0), 'id-8')
+                self.assertEqual(cache.get('x'), 'x')
+
+
+    def test_skips_expired_defaults(self):
+        r, w = os.pipe()
+        with os.fdopen(r) as stream, AnswerCache(), iinput.using(PipeSource(stream)):
+            self.assertEqual(iinput.string('host', default='localhost', timeout=0.01), 'localhost')
+            os.write(w, b'db1\n')
+            self.assertEqual(iinput.string('host', default='localhost', timeout=1), 'db1')
+            self.assertEqual(iinput.string('host', default='localhost', timeout=0.01), 'db1')
+        os.close(w)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import sys; sys.path.append('..');
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+
+from iinput import cli
+
+
+SPEC = {'name': 'alpha', 'age': {'kind': 'int', 'min': 0}, 'email': 'email'}
+
+
+class CliTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.schema = self.path('schema.json', json.dumps(SPEC))
+
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+
+    def path(self, name, content):
+        path = os.path.join(self.dir.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+
+    def run_validate(self, *args):
+        output = os.path.join(self.dir.name, 'out.jsonl')
+        code = cli.main(['validate', self.schema, *args, '-o', output])
+        with open(output) as f:
+            return code, [json.loads(line) for line in f]
+
+
+    def test_csv(self):
+        data = self.path('in.csv', "name,age,email\nada,36,ada@example.com\nb0b,-1,bob@example.com\n")
+        code, results = self.run_validate(data, '-w', '0')
+        self.assertEqual(code, 1)
+        self.assertEqual(results[0], {'record': 1, 'valid': True, 'errors': {}})
+        self.assertEqual(set(results[1]['errors']), {'name', 'age'})
+
+
+    def test_jsonl_process_pool(self):
+        lines = [json.dumps({'name': 'ada', 'age': i, 'email': 'ada@example.com' if i % 3 else 'x'}) for i in range(100)]
+        data = self.path('in.jsonl', '\n'.join(lines + ['not json']) + '\n')
+        code, results = self.run_validate(data, '-w', '2', '-c', '7')
+        self.assertEqual(code, 1)
+        self.assertEqual([r['record'] for r in results], list(range(1, 102)))
+        self.assertEqual([r['valid'] for r in results[:100]], [i % 3 != 0 for i in range(100)])
+        self.assertIn('record', results[100]['errors'])
+
+
+    def test_failures_only(self):
+        data = self.path('in.csv', "name,age,email\nada,36,ada@example.com\nada,x,ada@example.com\n")
+        code, results = self.run_validate(data, '-w', '0', '--failures-only')
+        self.assertEqual([r['record'] for r in results], [2])
+
+
+    def test_module_entry_point(self):
+        data = self.path('in.csv', "name,age,email\nada,36,ada@example.com\n")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, '-m', 'iinput', 'validate', self.schema, data, '-w', '1'],
+                                capture_output=True, text=True, cwd=root)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(json.loads(result.stdout)['valid'], True)
+        self.assertIn("1 of 1 records valid", result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
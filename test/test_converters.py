@@ -0,0 +1,61 @@
+import sys; sys.path.append('..');
+import datetime
+import decimal
+import ipaddress
+import unittest
+import uuid
+
+from iinput import converters, iinput, utils, ListSource, Table
+from iinput.converters import HexInt
+
+
+class ConvertersTest(unittest.TestCase):
+
+
+    def test_builtin_extras(self):
+        allowed = [decimal.Decimal, HexInt, datetime.date, ipaddress.IPv4Address, ipaddress.IPv6Address, uuid.UUID, str]
+        items = ['1.50', '0x1f', '2024-01-02', ' 10.0.0.1 ', '::1', '12345678-1234-5678-1234-567812345678', 'abc', '']
+        self.assertEqual(utils.auto_cast(items, allowed), [
+            decimal.Decimal('1.50'), 31, datetime.date(2024, 1, 2), ipaddress.IPv4Address('10.0.0.1'),
+            ipaddress.IPv6Address('::1'), uuid.UUID('12345678-1234-5678-1234-567812345678'), 'abc', None])
+
+
+    def test_builtins_keep_precedence(self):
+        self.assertEqual(utils.auto_cast(['1.5', '7', 'true', 'x'], [float, int, bool, decimal.Decimal]), [1.5, 7, True, None])
+        self.assertEqual(utils.auto_cast(['1', '0x10', '999.999.0.1'], [bool, HexInt, ipaddress.IPv4Address]), [True, 16, None])
+        self.assertIs(type(utils.auto_cast(['-0x1f'], [HexInt])[0]), HexInt)
+
+
+    def test_dispatch_is_cached_and_ordered(self):
+        order = converters.dispatch([uuid.UUID, str, decimal.Decimal, HexInt])
+        self.assertIs(order, converters.dispatch({decimal.Decimal, HexInt, uuid.UUID, str}))
+        self.assertEqual([c.type for c in order], [HexInt, uuid.UUID, decimal.Decimal])
+        with self.assertRaises(TypeError):
+            converters.dispatch([complex])
+
+
+    def test_empty_cells(self):
+        for t in [decimal.Decimal, datetime.date, datetime.time, ipaddress.IPv4Address, ipaddress.IPv6Address, uuid.UUID, HexInt]:
+            with self.assertRaises(ValueError):
+                converters.convert('', converters.dispatch([t]))
+        table = Table(['a', 'ip', 'd'], [int, ipaddress.IPv4Address, decimal.Decimal]).extend(['1,,', '2,10.0.0.1,1.5'])
+        self.assertEqual(table.rows, 1)
+        self.assertEqual([(e.row, e.column) for e in table.errors], [(1, 'ip'), (1, 'd')])
+
+
+    def test_register(self):
+        class Percent(float):
+            pass
+        converters.register(Percent, lambda s: float(s[:-1]) / 100, lambda s: s.endswith('%'), cost=5)
+        try:
+            with iinput.using(ListSource(['50', '12.5%'])):
+                self.assertEqual(iinput.value('share', [Percent]), 0.125)
+            self.assertEqual(list(Table(['p'], Percent).extend(['5%'])['p']), [0.05])
+        finally:
+            converters.unregister(Percent)
+        with self.assertRaises(TypeError):
+            converters.dispatch([Percent])
+
+
+if __name__ == '__main__':
+    unittest.main()
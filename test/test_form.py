@@ -0,0 +1,85 @@
+import sys; sys.path.append('..');
+import unittest
+
+from iinput import iinput, Form, Field, ListSource, validators
+
+
+class FormTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.form = Form({
+            'name': Field('alpha'),
+            'age': Field(int, min=0, max=150),
+            'ratio': Field(float, default=0.5),
+            'email': 'email',
+            'role': Field('string', choices=['admin', 'user'], required=False),
+            'tag': Field('regex', pattern=r'^[a-z]{3}$'),
+        })
+
+
+    def test_validate(self):
+        result = self.form.validate({'name': 'ada', 'age': 36, 'email': ' ada@example.com ', 'tag': 'abc'})
+        self.assertTrue(result)
+        self.assertEqual(result.values['age'], 36)
+        self.assertEqual(result.values['ratio'], 0.5)
+        self.assertEqual(result.values['email'], 'ada@example.com')
+        self.assertIsNone(result.values['role'])
+        self.assertEqual(result.values['tag'].group(0), 'abc')
+
+
+    def test_collects_all_errors(self):
+        result = self.form.validate({'name': 'a1', 'age': '200', 'email': 'x', 'role': 'root'})
+        self.assertFalse(result)
+        self.assertEqual(set(result.errors), {'name', 'age', 'email', 'role', 'tag'})
+        self.assertEqual(result.errors['tag'], 'required')
+
+
+    def test_validate_json_and_csv(self):
+        self.assertTrue(self.form.validate_json('{"name": "ada", "age": 3, "email": "a@b.io", "tag": "xyz"}'))
+        header = ['name', 'age', 'email', 'tag']
+        self.assertTrue(self.form.validate_csv_row('ada,3,a@b.io,xyz', header))
+        self.assertEqual(self.form.validate_csv_row(['ada', 'x', 'a@b.io', 'xyz'], header).errors, {'age': 'expected an integer'})
+        result = self.form.validate_csv_row('ada,3,,a@b.io,user')
+        self.assertEqual(result.values['ratio'], 0.5)
+        self.assertEqual(result.errors, {'tag': 'required'})
+        with self.assertRaises(ValueError):
+            self.form.validate_csv_row('ada,3,,a@b.io,user,abc,extra')
+
+
+    def test_bounds(self):
+        form = Form({'name': Field('string', min=2, max=4), 'tags': Field('values', max=2), 'n': Field('number', min=0)})
+        self.assertEqual(form.validate({'name': 'a', 'tags': 'x, y, z', 'n': '-1.5'}).errors,
+                         {'name': 'expected at least 2', 'tags': 'expected at most 2', 'n': 'expected at least 0'})
+        for kind in ['regex', 'boolean', 'email', 'yn', 'value']:
+            with self.assertRaises(ValueError):
+                Field(kind, pattern='x', min=1)
+        with self.assertRaises(ValueError):
+            Field(int, max='10')
+
+
+    def test_from_spec(self):
+        form = Form.from_spec({'n': 'int', 'v': {'kind': 'value', 'allowed_types': ['int', 'str']}})
+        self.assertEqual(form.validate({'n': '4', 'v': '7'}).values, {'n': 4, 'v': 7})
+        with self.assertRaises(ValueError):
+            Form.from_spec({'n': 'nope'})
+
+
+    def test_fill_matches_batch(self):
+        record = {'name': 'ada', 'age': '36', 'ratio': '', 'email': 'ada@example.com', 'role': '', 'tag': 'abc'}
+        with iinput.using(ListSource(['a1', 'ada', '-1', '36', '', 'ada@example.com', 'root', '', 'abc'])):
+            filled = self.form.fill()
+        batch = self.form.validate(record).values
+        self.assertEqual(filled.pop('tag').group(0), batch.pop('tag').group(0))
+        self.assertEqual(filled, batch)
+
+
+    def test_methods_share_validators(self):
+        with self.assertRaises(ValueError):
+            validators.integer('1.5')
+        with iinput.using(ListSource(['1.5', '2'])):
+            self.assertEqual(iinput.integer(''), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
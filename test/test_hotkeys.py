@@ -0,0 +1,86 @@
+import sys; sys.path.append('..');
+import threading
+import time
+import unittest
+from collections import namedtuple
+from unittest.mock import patch
+
+from iinput import hotkeys
+
+
+Event = namedtuple('Event', ['event_type', 'name'])
+
+
+class HotkeysTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.dispatcher = hotkeys.KeyDispatcher()
+        self.hooks = []
+        patcher = patch.multiple('keyboard', hook=self.hook, unhook=self.hooks.remove)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+    def hook(self, callback):
+        self.hooks.append(callback)
+        return callback
+
+
+    def press(self, *names, release=True):
+        for name in names:
+            self.dispatcher._on_event(Event('down', name))
+        if release:
+            for name in reversed(names):
+                self.dispatcher._on_event(Event('up', name))
+
+
+    def wait_in_thread(self, keys):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(self.dispatcher.wait(keys, timeout=5)))
+        thread.start()
+        while not self.dispatcher.index or not all(k.split('+')[0] in self.dispatcher.index for k in keys):
+            time.sleep(0.001)
+        return thread, result
+
+
+    def test_wait(self):
+        thread, result = self.wait_in_thread(['a', 'b'])
+        self.dispatcher._on_event(Event('up', 'a'))
+        self.press('x')
+        self.assertTrue(thread.is_alive())
+        self.press('b')
+        thread.join()
+        self.assertEqual(result, ['b'])
+        self.assertEqual(self.hooks, [])
+        self.assertEqual(self.dispatcher.index, {})
+
+
+    def test_shared_hook(self):
+        first, first_result = self.wait_in_thread(['a'])
+        second, second_result = self.wait_in_thread(['a', 'c'])
+        self.assertEqual(len(self.hooks), 1)
+        self.press('a')
+        first.join()
+        second.join()
+        self.assertEqual((first_result, second_result), (['a'], ['a']))
+        self.assertEqual(self.hooks, [])
+
+
+    def test_combo(self):
+        thread, result = self.wait_in_thread(['ctrl+s'])
+        self.press('s')
+        self.press('ctrl')
+        self.assertTrue(thread.is_alive())
+        self.press('ctrl', 's')
+        thread.join()
+        self.assertEqual(result, ['ctrl+s'])
+
+
+    def test_timeout(self):
+        self.assertIsNone(self.dispatcher.wait(['a'], timeout=0.01))
+        self.assertEqual(self.hooks, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
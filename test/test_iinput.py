@@ -1,13 +1,26 @@
 import sys; sys.path.append('..');
+import io
+import os
+import re
+import time
 import unittest
 from unittest.mock import patch
 
-from iinput import iinput
+from iinput import iinput, utils
+from iinput.sources import ListSource, PipeSource, PromptTimeout, TTYSource
 
 
 class IinputTest(unittest.TestCase):
 
 
+    def setUp(self):
+        iinput.set_source(TTYSource())
+
+
+    def tearDown(self):
+        iinput.set_source(None)
+
+
     def test_yn(self):
         test_data = {
             'y': 'y',
@@ -81,6 +94,38 @@ class IinputTest(unittest.TestCase):
                 self.assertEqual(iinput.values(prompt='', delimiter=' ', allowed_types=allowed_types, default=['d']), expected_return)
 
 
+    def test_values_bulk(self):
+        test_data = [
+            ('1 2 3', [int], [1, 2, 3]),
+            ('1.5 2', [int, float], [1.5, 2.0]),
+            ('1 a', [int, str], [1, 'a']),
+            ('0 1', [bool], [False, True]),
+            (' ', [int], ['d']),
+            ('1\t2 3', [int], [None, 3]),
+            ('9007199254740993 1.5', [int, float], [9007199254740993, 1.5]),
+        ]
+        for user_input, allowed_types, expected_return in test_data:
+            with patch('builtins.input', return_value=user_input):
+                values = iinput.values(prompt='', delimiter=' ', allowed_types=allowed_types, default=['d'], bulk=True)
+                self.assertEqual(list(values), expected_return)
+        with patch('builtins.input', return_value='1 2'):
+            self.assertEqual(iinput.values(prompt='', delimiter='\t', allowed_types=[int], bulk=True), [None])
+
+
+    def test_iter_values(self):
+        test_data = [
+            (' abc,  123 ,,123.4, True ', [str, int, float, bool], ['abc', 123, 123.4, True]),
+            ('abc,123', [int], [None, 123]),
+            (' ', [int], ['d']),
+        ]
+        for user_input, allowed_types, expected_return in test_data:
+            with patch('builtins.input', return_value=user_input):
+                self.assertEqual(list(iinput.iter_values(prompt='', allowed_types=allowed_types, default=['d'])), expected_return)
+
+        with patch('builtins.input', side_effect=['', ' ', '1,2']):
+            self.assertEqual(list(iinput.iter_values(prompt='', allowed_types=[int], default=None)), [1, 2])
+
+
     def test_match_value(self):
         with patch('builtins.input', return_value='1'):
             self.assertTrue(iinput.match_value(prompt='', target=1))
@@ -88,6 +133,11 @@ class IinputTest(unittest.TestCase):
             self.assertTrue(iinput.match_value(prompt='', target='c'))
         with patch('builtins.input', side_effect=['a', 'b', 'c', 'd']):
             self.assertFalse(iinput.match_value(prompt='', target='d', max_attempts=3))
+        with patch('builtins.input', side_effect=['a', 'b', 'd']):
+            self.assertTrue(iinput.match_value(prompt='', target='d', max_attempts=3))
+        with patch('builtins.input', side_effect=['a']) as read:
+            self.assertFalse(iinput.match_value(prompt='', target='a', max_attempts=0))
+            self.assertEqual(read.call_count, 0)
 
 
     def test_match_values(self):
@@ -100,6 +150,26 @@ class IinputTest(unittest.TestCase):
         with patch('builtins.input', side_effect=['', '', '', '1,2,3']):
             self.assertFalse(iinput.match_values(prompt='', targets=[1,2,3], max_attempts=3))
 
+        with patch('builtins.input', side_effect=['a', 'b', 'c, a, a']):
+            result = iinput.match_values(prompt='', targets=['a', 'c', 'a'], max_attempts=3)
+            self.assertTrue(result)
+            self.assertEqual(result.attempts, 3)
+
+        with patch('builtins.input', side_effect=['a, b, x, x']):
+            result = iinput.match_values(prompt='', targets=['a', 'a', 'b', 'c'], max_attempts=1)
+            self.assertFalse(result)
+            self.assertEqual(sorted(result.missing), ['a', 'c'])
+            self.assertEqual(result.extra, ['x', 'x'])
+
+        with patch('builtins.input', return_value='b, a, a'):
+            self.assertTrue(iinput.match_values(prompt='', targets=['a', 'b'], multiset=False))
+            self.assertFalse(iinput.match_values(prompt='', targets=['a', 'b'], max_attempts=1))
+
+        with patch('builtins.input', return_value='a') as read:
+            result = iinput.match_values(prompt='', targets=['a'], max_attempts=0)
+            self.assertFalse(result)
+            self.assertEqual((result.missing, result.attempts, read.call_count), (['a'], 0, 0))
+
     
     def test_boolean(self):
         test_data = {
@@ -130,6 +200,7 @@ class IinputTest(unittest.TestCase):
             '123.4': 123.4,
             '-123': -123,
             '+123.4': 123.4,
+            '1e5': 1e5,
             '': 'd',
             '   ': 'd',
         }
@@ -156,7 +227,7 @@ class IinputTest(unittest.TestCase):
             with patch('builtins.input', return_value=user_input):
                 self.assertEqual(iinput.integer(prompt='', default='d'), expected_return)
         
-        with patch('builtins.input', side_effect=['true', 'abc', 'abc123', '1 2', '', '123.4', '123']):
+        with patch('builtins.input', side_effect=['true', 'abc', 'abc123', '1 2', '', '123.4', '\u00b2', '--1', '123']):
             self.assertEqual(iinput.integer(prompt=''), 123)
 
 
@@ -261,13 +332,26 @@ class IinputTest(unittest.TestCase):
 
     def test_lines(self):
         test_data = [
-            (['a\n', ' b \n', 'c\n', '\n'], ['a', ' b ', 'c', '']),
+            ('a\n b \nc\n\n', ['a', ' b ', 'c', '']),
+            ('a\nb', ['a', 'b']),
+            ('', []),
         ]
         for user_input, expected_return in test_data:
-            with patch('sys.stdin.readlines', return_value=user_input):
+            with patch('sys.stdin', io.StringIO(user_input)):
                 self.assertEqual(iinput.lines(prompt=''), expected_return)
 
 
+    def test_iter_lines(self):
+        with patch('sys.stdin', io.StringIO('a\nbb\nccc\n')):
+            self.assertEqual(list(iinput.iter_lines(prompt='', chunk_size=2)), ['a', 'bb', 'ccc'])
+        with patch('sys.stdin', io.StringIO('a\nbb\nccc\n')):
+            self.assertEqual(list(iinput.iter_lines(prompt='', max_lines=2)), ['a', 'bb'])
+        with patch('sys.stdin', io.StringIO('a\nbb\nccc\n')):
+            self.assertEqual(list(iinput.iter_lines(prompt='', max_chars=5)), ['a', 'bb'])
+        with patch('sys.stdin', io.StringIO('a\nbb\nccc\n')):
+            self.assertEqual(list(iinput.iter_lines(prompt='', max_chars=4)), ['a'])
+
+
     def test_selection(self):
         test_data = {
             ' a ': ('a', 1),
@@ -329,6 +413,17 @@ class IinputTest(unittest.TestCase):
         with patch('builtins.input', side_effect=['', 'test', 'test@test.com']): 
             self.assertEqual(iinput.email(prompt='', default=None), 'test@test.com')
 
+        test_data = {
+            'first.last+tag@mail.example.org': 'first.last+tag@mail.example.org',
+            '<ops@example.io>': 'ops@example.io',
+        }
+        for user_input, expected_return in test_data.items():
+            with patch('builtins.input', return_value=user_input):
+                self.assertEqual(iinput.email(prompt=''), expected_return)
+
+        with patch('builtins.input', side_effect=['a,b@c,d', 'x@localhost', 'x@-bad.com', 'x@y.c', 'x@y.co']):
+            self.assertEqual(iinput.email(prompt=''), 'x@y.co')
+
 
     def test_password(self):
         test_data = {
@@ -351,10 +446,12 @@ class IinputTest(unittest.TestCase):
             self.assertTrue(iinput.match_password(prompt='', target='password123'))
         with patch('getpass.getpass', side_effect=['a', 'b', 'c', 'password123']):
             self.assertFalse(iinput.match_password(prompt='', target='password123', max_attempts=3))
+        with patch('getpass.getpass', side_effect=['a', 'b', 'password123']):
+            self.assertTrue(iinput.match_password(prompt='', target='password123', max_attempts=3))
 
 
     def test_regex(self):
-        r = "[\w\.,]+@[\w\.,]+\.\w+"
+        r = r"[\w\.,]+@[\w\.,]+\.\w+"
         test_data = {
             ' test@test.com 123': 'test@test.com',
             'test@test.com': 'test@test.com',
@@ -369,6 +466,35 @@ class IinputTest(unittest.TestCase):
         with patch('builtins.input', side_effect=['', '  ', 'test', 'test@test.com']): 
             self.assertEqual(iinput.regex(prompt='', r=r).group(0), 'test@test.com')
 
+        pattern = re.compile(r"id-(\d+)", re.IGNORECASE)
+        with patch('builtins.input', side_effect=['id-x', 'ID-42']):
+            self.assertEqual(iinput.regex(prompt='', r=pattern).group(1), '42')
+        with self.assertRaises(ValueError):
+            iinput.regex(prompt='', r=pattern, flags=re.IGNORECASE)
+
+        before = utils.pattern_cache_info()
+        for _ in range(3):
+            with patch('builtins.input', return_value='abc'):
+                iinput.regex(prompt='', r=r"^b?ab+c$", flags=re.MULTILINE)
+        after = utils.pattern_cache_info()
+        self.assertEqual(after.misses - before.misses, 1)
+        self.assertEqual(after.hits - before.hits, 2)
+
+
+    def test_source(self):
+        with iinput.using(ListSource(['', 'x', '42', 'n'])):
+            self.assertEqual(iinput.integer(prompt=''), 42)
+            self.assertEqual(iinput.yn(prompt=''), 'n')
+            with self.assertRaises(EOFError):
+                iinput.string(prompt='', default=None)
+
+        with iinput.using(ListSource(['a', ' b ', 'c'])):
+            self.assertEqual(list(iinput.iter_lines(prompt='', max_lines=2)), ['a', ' b '])
+            self.assertEqual(iinput.lines(prompt=''), ['c'])
+
+        with iinput.using(ListSource(['secret'])):
+            self.assertEqual(iinput.password(prompt=''), 'secret')
+
 
     def test_wait_for_key_press(self):
         pass
@@ -382,5 +508,34 @@ class IinputTest(unittest.TestCase):
         pass
 
 
+    def test_timeouts(self):
+        r, w = os.pipe()
+        with os.fdopen(r) as stream, iinput.using(PipeSource(stream)):
+            self.assertEqual(iinput.integer('n', default=7, timeout=0.01), 7)
+            self.assertEqual(iinput.selection({1: 'a'}, default='1', timeout=0.01), ('1', 'a'))
+            with self.assertRaises(PromptTimeout):
+                iinput.integer('n', timeout=0.01)
+            with self.assertRaises(TimeoutError):
+                iinput.match_values('v', ['a'], deadline=time.monotonic())
+            self.assertEqual(list(iinput.iter_values('v', allowed_types=[int], default=[0], timeout=0.01)), [0])
+            with self.assertRaises(PromptTimeout):
+                list(iinput.iter_values('v', default=None, timeout=0.01))
+            with self.assertRaises(PromptTimeout):
+                list(iinput.iter_lines('l', timeout=0.01))
+            os.write(w, b'x\n5\n1, 2\na\n')
+            self.assertEqual(iinput.integer('n', timeout=1), 5)
+            self.assertEqual(list(iinput.iter_values('v', allowed_types=[int], timeout=1)), [1, 2])
+            self.assertEqual(list(iinput.iter_lines('l', max_lines=1, deadline=time.monotonic() + 1)), ['a'])
+            iinput.set_timeout(0.01)
+            try:
+                self.assertEqual(iinput.string('s', default='none'), 'none')
+                self.assertEqual(iinput.string('s', default='none', timeout=60), 'none')
+            finally:
+                iinput.set_timeout(None)
+            os.close(w)
+            with self.assertRaises(EOFError):
+                iinput.integer('n', timeout=1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,39 @@
+import sys; sys.path.append('..');
+import os
+import subprocess
+import unittest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = float(os.environ.get('IINPUT_IMPORT_BUDGET_MS', 250))
+LAZY_MODULES = ['keyboard', 'asyncio', 'numpy', 'getpass', 'concurrent.futures', 'iinput.aio', 'iinput.cache', 'iinput.hotkeys', 'iinput.metrics', 'iinput.scheduler', 'sqlite3']
+
+
+def import_times():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import iinput'],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+class ImportTest(unittest.TestCase):
+
+
+    def test_lazy_modules(self):
+        times = import_times()
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, times)
+
+
+    def test_import_budget(self):
+        self.assertLess(min(import_times()['iinput'] for _ in range(3)), BUDGET_MS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import sys; sys.path.append('..');
+import io
+import threading
+import unittest
+from unittest.mock import patch
+
+from iinput import iinput, Menu, ListSource
+
+
+class MenuTest(unittest.TestCase):
+
+
+    def test_render(self):
+        menu = Menu({1: 'one', 'b': 2})
+        self.assertEqual(menu.render(), "menu\n\t[1]: one\n\t[b]: 2\n\n")
+        self.assertEqual(menu.render(''), "\t[1]: one\n\t[b]: 2\n\n")
+        self.assertIs(menu.render('x'), menu.render('x'))
+
+
+    def test_mapping(self):
+        menu = Menu({1: 'one', 'b': 2})
+        self.assertIn('1', menu)
+        self.assertNotIn(1, menu)
+        self.assertEqual(menu['b'], 2)
+        self.assertEqual(list(menu), ['1', 'b'])
+        self.assertEqual(len(menu), 2)
+        with self.assertRaises(TypeError):
+            menu.options['c'] = 3
+
+
+    def test_search(self):
+        menu = Menu({f"h{i}": f"host-{i:05d}.{'eu' if i % 2 else 'us'}" for i in range(1000)})
+        self.assertEqual(menu.search('00-2'), [])
+        self.assertEqual(len(menu.search('.EU')), 500)
+        self.assertEqual(menu.search('00.us'), list(range(0, 1000, 100)))
+        narrowed = menu.search('host-0099', within=menu.search('HOST-009'))
+        self.assertEqual(narrowed, menu.search('host-0099'))
+        self.assertEqual(len(narrowed), 10)
+        self.assertEqual(menu.search('h9'), [9] + list(range(90, 100)) + list(range(900, 1000)))
+        self.assertEqual(menu.search('h9', within=range(100)), [9] + list(range(90, 100)))
+        self.assertEqual(Menu({'k1': 'xbc', 'k2': 'abc'}).search('bc'), [0, 1])
+        self.assertEqual(menu.keys(), menu.options.keys())
+
+
+    def test_paged_selection(self):
+        menu = Menu({i: f"item {i}" for i in range(100)})
+        answers = ['>', '>', '<', '/item 7', '>', '/item 77', '/', '42']
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout, iinput.using(ListSource(answers)):
+            self.assertEqual(iinput.selection(menu, prompt='', page_size=10), ('42', 'item 42'))
+        pages = stdout.getvalue().split('menu\n')[1:]
+        self.assertEqual(len(pages), len(answers))
+        self.assertTrue(pages[0].startswith("\t[0]: item 0\n"))
+        self.assertIn("page 1/10, 100 of 100 options", pages[0])
+        self.assertTrue(pages[2].startswith("\t[20]: item 20\n"))
+        self.assertTrue(pages[3].startswith("\t[10]: item 10\n"))
+        self.assertIn("page 1/2, 11 of 100 options matching 'item 7'", pages[4])
+        self.assertIn("page 2/2", pages[5])
+        self.assertIn("page 1/1, 1 of 100 options matching 'item 77'", pages[6])
+        self.assertNotIn('matching', pages[7])
+
+        short = Menu({'k1': 'xbc', 'k2': 'abc'})
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout, iinput.using(ListSource(['/bc', '/abc', '/k', '/xk', 'k2'])):
+            self.assertEqual(iinput.selection(short, prompt='', page_size=10), ('k2', 'abc'))
+        pages = stdout.getvalue().split('menu\n')[1:]
+        self.assertIn("2 of 2 options matching 'bc'", pages[1])
+        self.assertIn("1 of 2 options matching 'abc'", pages[2])
+        self.assertIn("2 of 2 options matching 'k'", pages[3])
+        self.assertIn("0 of 2 options matching 'xk'", pages[4])
+
+        with patch('sys.stdout', new_callable=io.StringIO), iinput.using(ListSource(['/zzz', ''])):
+            self.assertEqual(iinput.selection(menu, prompt='', page_size=10, default='3'), ('3', 'item 3'))
+
+
+    def test_select_int_keys(self):
+        menu = Menu({i: i * 10 for i in range(1, 10001)})
+        selection = menu.select(['1-500', '!13', '!100-199', '9999'])
+        self.assertEqual(len(selection), 500 - 1 - 100 + 1)
+        self.assertIsInstance(selection.selected, int)
+        self.assertIn('12', selection)
+        self.assertNotIn('13', selection)
+        self.assertNotIn('10000', selection)
+        self.assertNotIn('x', selection)
+        self.assertEqual(selection['9999'], 99990)
+        with self.assertRaises(KeyError):
+            selection['150']
+        self.assertEqual(list(selection)[:3], ['1', '2', '3'])
+
+        self.assertEqual(len(menu.select(['*'])), 10000)
+        self.assertEqual(len(menu.select(['!1-9999'])), 1)
+        self.assertEqual(len(menu.select(['9990-20000'])), 11)
+        self.assertIsNone(menu.select(['5-1']))
+        self.assertIsNone(menu.select(['a-b']))
+        self.assertIsNone(menu.select(['0']))
+        self.assertEqual(len(menu.select(['2000000000-2000000001'])), 0)
+        self.assertEqual(len(menu.select(['0-0', '10001-99999999999999999999'])), 0)
+
+        ids = Menu({i: f"object {i}" for i in range(5000, 5010)})
+        selection = ids.select(['5000-5003', '!5001', '5009'])
+        self.assertIsInstance(selection.selected, int)
+        self.assertEqual(list(selection), ['5000', '5002', '5003', '5009'])
+        self.assertIn('5002', selection)
+        self.assertNotIn('5001', selection)
+        self.assertEqual(len(ids.select(['1-4999999999'])), 10)
+
+        sparse = Menu({1: 'a', 7: 'b', 10 ** 12: 'c', '01': 'd'})
+        self.assertEqual(sparse.select(['1-10']), {'1': 'a', '7': 'b'})
+        self.assertEqual(sparse.select(['!5-1000000000000']), {'1': 'a', '01': 'd'})
+
+
+    def test_select_str_keys(self):
+        menu = Menu({'a': 1, 'b': 2, 'c-d': 3, '!e': 4})
+        self.assertEqual(menu.select(['*', '!b']), {'a': 1, 'c-d': 3, '!e': 4})
+        self.assertEqual(menu.select(['!a', '!c-d']), {'b': 2, '!e': 4})
+        self.assertEqual(menu.select(['!e']), {'!e': 4})
+        self.assertIsNone(menu.select(['a-b']))
+        self.assertEqual(Menu({1: 'x', '01': 'y'}).select(['*']), {'1': 'x', '01': 'y'})
+
+
+    def test_multiselection_ranges(self):
+        menu = {i: f"item {i}" for i in range(10)}
+        with patch('sys.stdout', new_callable=io.StringIO):
+            with iinput.using(ListSource(['x-y', '3-1', '!0-9', '2-4, !3', '1,2'])):
+                self.assertEqual(iinput.multiselection(menu), {'2': 'item 2', '4': 'item 4'})
+                self.assertEqual(iinput.multiselection(menu), {'1': 'item 1', '2': 'item 2'})
+
+
+    def test_single_write(self):
+        menu = Menu({i: f"option {i}" for i in range(1000)})
+        stdout = io.StringIO()
+        writes = []
+        stdout.write = lambda text: writes.append(text)
+        with patch('sys.stdout', stdout), iinput.using(ListSource(['999'])):
+            self.assertEqual(iinput.selection(menu, prompt=''), ('999', 'option 999'))
+        self.assertEqual(writes[0], menu.render())
+        self.assertEqual(writes[1:], [])
+
+
+    def test_reuse_across_threads(self):
+        menu = Menu({i: i * i for i in range(100)})
+        results = {}
+
+        def select(i):
+            with iinput.using(ListSource(['x', str(i), f"{i}, {i + 1}"])):
+                results[i] = (iinput.selection(menu), iinput.multiselection(menu))
+
+        with patch('sys.stdout', new_callable=io.StringIO):
+            threads = [threading.Thread(target=select, args=(i,)) for i in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        for i in range(20):
+            self.assertEqual(results[i], ((str(i), i * i), {str(i): i * i, str(i + 1): (i + 1) ** 2}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys; sys.path.append('..');
+import os
+import tempfile
+import unittest
+
+from iinput import iinput, ListSource, PipeSource
+from iinput import metrics
+
+
+class MetricsTest(unittest.TestCase):
+
+
+    def tearDown(self):
+        metrics.disable()
+
+
+    def test_records(self):
+        records = []
+        metrics.enable(records.append)
+        with iinput.using(ListSource(['x', '1.5', '5', '', 'hunter2', 'no', 'hunter2'])):
+            self.assertEqual(iinput.integer('n'), 5)
+            self.assertEqual(iinput.integer('m', default=3), 3)
+            iinput.password('pwd')
+            self.assertTrue(iinput.match_password('again', 'hunter2', max_attempts=3))
+        r, w = os.pipe()
+        with os.fdopen(r) as stream, iinput.using(PipeSource(stream)):
+            iinput.yn('ok?', default='y', timeout=0.01)
+        os.close(w)
+        metrics.disable()
+        with iinput.using(ListSource(['1'])):
+            iinput.integer('n')
+
+        self.assertEqual([(r.method, r.prompt, r.attempts, r.outcome) for r in records], [
+            ('integer', 'n', 3, 'answered'),
+            ('integer', 'm', 1, 'default'),
+            ('password', 'pwd', 1, 'answered'),
+            ('match_password', 'again', 2, 'answered'),
+            ('yn', 'ok?', 1, 'timeout'),
+        ])
+        self.assertTrue(all(r.wait >= 0 and r.cpu >= 0 for r in records))
+        self.assertNotIn('hunter2', ''.join(map(repr, records)))
+
+
+    def test_histogram_and_textfile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'iinput.prom')
+            histogram = metrics.Histogram(buckets=(1.0,))
+            exporter = metrics.PrometheusTextfile(path, interval=0, histogram=histogram)
+            metrics.enable(exporter)
+            with iinput.using(ListSource(['a', '1', '2'])):
+                iinput.integer('say "n"')
+                iinput.integer('say "n"')
+            series = histogram.snapshot()[('integer', 'say "n"')]
+            self.assertEqual((series['count'], series['attempts'], series['wait']), (2, 3, [2, 0]))
+            with open(path) as f:
+                text = f.read()
+        labels = 'method="integer",prompt="say \\"n\\""'
+        self.assertIn(f'iinput_prompt_wait_seconds_bucket{{{labels},le="+Inf"}} 2', text)
+        self.assertIn(f'iinput_prompt_attempts_total{{{labels}}} 3', text)
+        self.assertIn(f'iinput_prompt_outcomes_total{{{labels},outcome="answered"}} 2', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys; sys.path.append('..');
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from iinput import iinput, ReplaySource
+from iinput.replay import prompt_key
+
+
+class ReplayTest(unittest.TestCase):
+
+
+    def test_prompt_key(self):
+        self.assertEqual(prompt_key('name: '), 'name')
+        self.assertEqual(prompt_key('deploy [y/n]: (n) ', rendered=True), 'deploy')
+        self.assertEqual(prompt_key('enter selection> (3) ', rendered=True), 'enter selection')
+        self.assertEqual(prompt_key('port: (8080) ', rendered=True), prompt_key('port'))
+        self.assertEqual(prompt_key('Disk size (GB): ', rendered=True), prompt_key('Disk size (GB)'))
+        self.assertEqual(prompt_key('Disk size (GB): (20) ', rendered=True), 'Disk size (GB)')
+        self.assertEqual(prompt_key('port: (8080)'), 'port: (8080)')
+
+
+    def test_keyed_and_ordered(self):
+        replay = ReplaySource([
+            {'prompt': 'deploy', 'answer': True},
+            {'prompt': 'port', 'answer': ['x', 8080]},
+            'ada',
+            {'prompt': 'extra', 'answer': 'unused'},
+        ])
+        with iinput.using(replay):
+            self.assertEqual(iinput.integer('port'), 8080)
+            self.assertEqual(iinput.boolean('deploy'), True)
+            self.assertEqual(iinput.string('name'), 'ada')
+            with self.assertRaises(EOFError):
+                iinput.email('email')
+        report = replay.report()
+        self.assertFalse(report)
+        self.assertEqual(report.missing, ['email'])
+        self.assertEqual(report.unused, {'extra': ['unused']})
+
+
+    def test_parenthesised_prompt(self):
+        replay = ReplaySource({'Disk size (GB)': ['20', ''], 'Region (EU/US)': 'eu'})
+        with iinput.using(replay):
+            self.assertEqual(iinput.integer('Disk size (GB)'), 20)
+            self.assertEqual(iinput.integer('Disk size (GB)', default=10), 10)
+            self.assertEqual(iinput.string('Region (EU/US)', default='us'), 'eu')
+        self.assertTrue(replay.report())
+
+
+    def test_key_waits(self):
+        with iinput.using(ReplaySource({'press any key to continue...': ['x'], 'go': ['n', 'y']})):
+            iinput.wait_for_any_key_press()
+            self.assertEqual(iinput.wait_for_key_press('y', prompt='go'), 'y')
+
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = {
+                'a.json': json.dumps({'n': 1}),
+                'a.jsonl': '{"prompt": "n", "answer": 1}\n\n2\n',
+                'a.yaml': 'n: [1]\n',
+            }
+            for name, content in paths.items():
+                path = os.path.join(directory, name)
+                with open(path, 'w') as f:
+                    f.write(content)
+                replay = ReplaySource.load(path)
+                with iinput.using(replay):
+                    self.assertEqual(iinput.integer('n'), 1)
+                self.assertEqual(bool(replay.report()), name != 'a.jsonl')
+
+
+    def test_throughput(self):
+        count = 5000
+        replay = ReplaySource({f'field {i}': i for i in range(count)})
+        start = time.perf_counter()
+        with iinput.using(replay):
+            for i in reversed(range(count)):
+                self.assertEqual(iinput.integer(f'field {i}'), i)
+        self.assertTrue(replay.report())
+        self.assertLess(time.perf_counter() - start, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
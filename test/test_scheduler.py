@@ -0,0 +1,120 @@
+import sys; sys.path.append('..');
+import asyncio
+import threading
+import time
+import unittest
+
+from iinput import iinput, InputSource, ListSource
+from iinput.scheduler import PromptScheduler, priority
+
+
+class GatedSource(InputSource):
+
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.prompts = []
+        self.gate = threading.Event()
+
+
+    def readline(self, prompt='', timeout=None):
+        self.prompts.append(prompt.strip())
+        self.gate.wait()
+        return self.answers[prompt.split()[0]]
+
+
+class SchedulerTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.source = GatedSource({'first:': 'x', 'deploy': 'y', 'a:': 'a', 'b:': 'b'})
+        iinput.set_source(self.source)
+
+
+    def tearDown(self):
+        iinput.set_source(None)
+
+
+    def wait_for(self, condition):
+        end = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), end)
+            time.sleep(0.001)
+
+
+    def test_coalesces_identical_prompts(self):
+        results = []
+        with PromptScheduler() as scheduler:
+            first = scheduler.submit(iinput.string, 'first')
+            self.wait_for(lambda: self.source.prompts)
+            workers = [threading.Thread(target=lambda: results.append(iinput.yn('deploy'))) for _ in range(32)]
+            for worker in workers:
+                worker.start()
+            self.wait_for(lambda: sum(len(job.futures) for job in scheduler.pending.values()) == 32)
+            self.assertEqual(len(scheduler.pending), 1)
+            self.source.gate.set()
+            for worker in workers:
+                worker.join()
+            self.assertEqual(first.result(), 'x')
+        self.assertEqual(results, ['y'] * 32)
+        self.assertEqual(self.source.prompts, ['first:', 'deploy [y/n]:'])
+
+
+    def test_priorities(self):
+        with PromptScheduler() as scheduler:
+            scheduler.submit(iinput.string, 'first')
+            self.wait_for(lambda: self.source.prompts)
+            low = scheduler.submit(iinput.string, 'b')
+
+            def ask_urgently():
+                with priority(-1):
+                    iinput.string('a')
+            high = threading.Thread(target=ask_urgently)
+            high.start()
+            self.wait_for(lambda: scheduler.queue.qsize() == 2)
+            self.source.gate.set()
+            high.join()
+            self.assertEqual(low.result(), 'b')
+        self.assertEqual(self.source.prompts, ['first:', 'a:', 'b:'])
+
+
+    def test_iterators(self):
+        threads = []
+
+        class Recorded(ListSource):
+            def readline(self, prompt='', timeout=None):
+                threads.append(threading.current_thread().name)
+                return super().readline(prompt, timeout)
+
+        results = []
+
+        def worker():
+            with iinput.using(Recorded(['a', 'b', '1, 2', 'c'])):
+                results.append(list(iinput.iter_lines('lines', max_lines=2)))
+                results.append(list(iinput.iter_values('values', allowed_types=[int])))
+                results.append(asyncio.run(collect(iinput.aiter_lines('rest', timeout=5))))
+
+        async def collect(items):
+            return [item async for item in items]
+
+        with PromptScheduler() as scheduler:
+            thread = threading.Thread(target=worker, name='worker')
+            thread.start()
+            thread.join()
+            dispatcher = scheduler.thread.name
+        self.assertEqual(results, [['a', 'b'], [1, 2], ['c']])
+        self.assertEqual(set(threads), {dispatcher})
+
+
+    def test_errors_and_thread_sources(self):
+        with PromptScheduler() as scheduler:
+            with iinput.using(ListSource(['5'])):
+                self.assertEqual(iinput.integer('n'), 5)
+                with self.assertRaises(EOFError):
+                    iinput.integer('n')
+            self.assertIsNotNone(scheduler.thread)
+        self.assertIsNone(scheduler.thread)
+
+
+if __name__ == '__main__':
+    unittest.main()
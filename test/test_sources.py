@@ -0,0 +1,154 @@
+import sys; sys.path.append('..');
+import asyncio
+import io
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from iinput import iinput, sources, terminal
+from iinput.sources import FileSource, ListSource, PipeSource, TTYSource
+
+
+class SourcesTest(unittest.TestCase):
+
+
+    def tearDown(self):
+        sources.set_source(None)
+
+
+    def test_custom_source(self):
+        class Incomplete(sources.InputSource):
+            pass
+
+        class Echo(sources.InputSource):
+            def readline(self, prompt='', timeout=None):
+                return prompt
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+        with iinput.using(Echo()):
+            self.assertEqual(iinput.string(prompt='hi'), 'hi:')
+
+
+    def test_pipe_source(self):
+        source = PipeSource(io.StringIO('a\n b \nc'))
+        self.assertEqual(source.readline('ignored: '), 'a')
+        self.assertEqual(source.readline(), ' b ')
+        self.assertEqual(source.readline(), 'c')
+        with self.assertRaises(EOFError):
+            source.readline()
+
+        with patch('sys.stdin', io.StringIO('x\ny\n')), patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.assertEqual(PipeSource().readline('prompt: '), 'x')
+            self.assertEqual(list(PipeSource().iter_lines()), ['y'])
+            self.assertEqual(stdout.getvalue(), '')
+
+
+    def test_file_source(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write('1\n2\n')
+        try:
+            with FileSource(f.name) as source:
+                self.assertEqual(source.readline(), '1')
+                self.assertEqual(list(source.iter_lines()), ['2'])
+        finally:
+            os.remove(f.name)
+
+
+    def test_list_source(self):
+        source = ListSource(['a', 1])
+        self.assertEqual(source.readline(), 'a')
+        self.assertEqual(source.getpass(), '1')
+        with self.assertRaises(EOFError):
+            source.readline()
+        self.assertEqual(list(ListSource(['a', 'bb', 'c']).iter_lines(max_chars=5)), ['a', 'bb'])
+
+
+    def test_pipe_source_timeout(self):
+        r, w = os.pipe()
+        with os.fdopen(r) as stream:
+            source = PipeSource(stream)
+            with self.assertRaises(sources.PromptTimeout):
+                source.readline('', 0.01)
+            os.write(w, b'a\r\nb')
+            self.assertEqual(source.readline('', 1), 'a')
+            with self.assertRaises(sources.PromptTimeout):
+                source.readline('', 0.01)
+            os.write(w, 'ä\nc\n'.encode())
+            os.close(w)
+            self.assertEqual(source.readline(), 'bä')
+            self.assertEqual(list(source.iter_lines()), ['c'])
+            with self.assertRaises(EOFError):
+                source.readline('', 1)
+
+
+    def test_pipe_source_mixed_reads(self):
+        r, w = os.pipe()
+        os.write(w, b'1\n2\n3\nk4\n5\n6')
+        os.close(w)
+        with os.fdopen(r) as stream, patch('sys.stdin', stream), iinput.using(PipeSource()):
+            self.assertEqual(iinput.integer('a'), 1)
+            self.assertEqual(iinput.integer('b', timeout=2), 2)
+            self.assertEqual(iinput.integer('c'), 3)
+            self.assertEqual(terminal.read_key(stream, timeout=1), 'k')
+            self.assertEqual(iinput.integer('d', timeout=2), 4)
+            self.assertEqual(list(iinput.iter_lines('rest')), ['5', '6'])
+            self.assertEqual(terminal.read_key(stream, timeout=1), '')
+
+
+    def test_pipe_source_with_direct_reads(self):
+        r, w = os.pipe()
+        os.write(w, b'0\n1\n2\n3\n4\n5\n6\n7')
+        os.close(w)
+        with os.fdopen(r) as stream, patch('sys.stdin', stream), iinput.using(PipeSource()):
+            self.assertEqual(stream.readline(), '0\n')
+            self.assertEqual(iinput.integer('a'), 1)
+            self.assertEqual(input(), '2')
+            self.assertEqual(iinput.integer('b', timeout=2), 3)
+            self.assertEqual(input(), '4')
+            self.assertEqual(asyncio.run(iinput.ainteger('c')), 5)
+            self.assertEqual(stream.readline(), '6\n')
+            self.assertEqual(iinput.integer('d', timeout=2), 7)
+            with self.assertRaises(EOFError):
+                input()
+
+
+    def test_deadlines(self):
+        self.assertIsNone(sources.remaining())
+        with sources.deadline(sources.deadline_for(timeout=60)):
+            with sources.deadline(sources.deadline_for(timeout=0)):
+                self.assertEqual(sources.remaining(), 0)
+            self.assertGreater(sources.remaining(), 50)
+        with patch('iinput.sources._global_timeout', 5):
+            self.assertEqual(sources.remaining(), 5)
+            self.assertLessEqual(sources.deadline_for(timeout=60) - sources.deadline_for(), 0.1)
+
+
+    def test_auto_source(self):
+        with patch('sys.stdin', io.StringIO()):
+            self.assertIsInstance(sources.get_source(), PipeSource)
+            self.assertIs(sources.get_source(), sources.get_source())
+        tty = io.StringIO()
+        tty.isatty = lambda: True
+        with patch('sys.stdin', tty):
+            self.assertIsInstance(sources.get_source(), TTYSource)
+
+
+    def test_set_source_and_using(self):
+        outer, inner = ListSource([]), ListSource([])
+        sources.set_source(outer)
+        self.assertIs(sources.get_source(), outer)
+        with sources.using(inner):
+            self.assertIs(sources.get_source(), inner)
+            seen = []
+            thread = threading.Thread(target=lambda: seen.append(sources.get_source()))
+            thread.start()
+            thread.join()
+            self.assertIs(seen[0], outer)
+        self.assertIs(sources.get_source(), outer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import sys; sys.path.append('..');
+import array
+import io
+import unittest
+from unittest.mock import patch
+
+from iinput import iinput, ListSource, Table, TTYSource
+
+
+class TableTest(unittest.TestCase):
+
+
+    def test_typed_columns(self):
+        lines = ['db1, 5432, 0.5, true', '', 'db2,6432,1,0']
+        table = Table(['host', 'port', 'ratio', 'primary'], [str, int, float, bool]).extend(lines)
+        self.assertTrue(table)
+        self.assertEqual(table.rows, 2)
+        self.assertEqual(table['host'], ['db1', 'db2'])
+        self.assertEqual(table['port'], array.array('q', [5432, 6432]))
+        self.assertEqual(table['ratio'], array.array('d', [0.5, 1.0]))
+        self.assertEqual(list(table['primary']), [True, False])
+        self.assertIs(table['primary'][0], True)
+        self.assertEqual(table.row(1), ['db2', 6432, 1.0, False])
+        self.assertIs(table.row(1)[3], False)
+        self.assertEqual(list(table), ['host', 'port', 'ratio', 'primary'])
+
+
+    def test_cell_errors(self):
+        table = Table(['a', 'b'], int).extend(['1,2', 'x,y', '3', '4,99999999999999999999', '5,6'])
+        self.assertFalse(table)
+        self.assertEqual(table.rows, 2)
+        self.assertEqual(list(table['a']), [1, 5])
+        self.assertEqual([(e.row, e.column) for e in table.errors], [(2, 'a'), (2, 'b'), (3, None), (4, 'b')])
+        self.assertEqual(str(table.errors[0]), "row 2, column 'a': expected an integer")
+        self.assertEqual(str(table.errors[3]), "row 4, column 'b': out of range")
+        with self.assertRaises(ValueError):
+            Table(['a'], [int, int])
+        with self.assertRaises(ValueError):
+            Table(['a'], list)
+
+
+    def test_iinput_table(self):
+        with iinput.using(ListSource(['1;2.5', '2;x'])):
+            table = iinput.table('points', ['n', 'v'], [int, float], delimiter=';', numpy=True)
+        self.assertEqual(table['n'].dtype.name, 'int64')
+        self.assertEqual(table['n'].tolist(), [1])
+        self.assertEqual(table['v'].tolist(), [2.5])
+        with self.assertRaises(TypeError):
+            table.append('3;1.5', ';')
+
+        table = Table(['n', 'ok'], [int, bool]).extend(['1,true'])
+        arrays = table.to_numpy()
+        self.assertTrue(table.append('2,false'))
+        self.assertEqual(list(table['ok']), [True, False])
+        self.assertEqual(arrays['n'].tolist(), [1])
+        self.assertEqual(arrays['ok'].tolist(), [True])
+
+        iinput.set_source(TTYSource())
+        try:
+            with patch('sys.stdin', io.StringIO('1\nx\n')), patch('sys.stdout', new_callable=io.StringIO) as stdout:
+                table = iinput.table('n', ['n'], int)
+        finally:
+            iinput.set_source(None)
+        self.assertEqual(list(table['n']), [1])
+        self.assertIn("row 2, column 'n': expected an integer", stdout.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys; sys.path.append('..');
+import io
+import os
+import termios
+import unittest
+from unittest.mock import patch
+
+from iinput import iinput, terminal
+from iinput.sources import PromptTimeout, TTYSource
+
+
+class TerminalTest(unittest.TestCase):
+
+
+    def setUp(self):
+        self.master, slave = os.openpty()
+        self.tty = os.fdopen(slave, 'r')
+
+
+    def tearDown(self):
+        self.tty.close()
+        os.close(self.master)
+
+
+    def test_read_key(self):
+        attributes = termios.tcgetattr(self.tty.fileno())
+        for typed, expected in [(b'a', 'a'), ('ä'.encode(), 'ä'), (b'\x1b[A', '\x1b[A')]:
+            os.write(self.master, typed)
+            self.assertEqual(terminal.read_key(self.tty), expected)
+            self.assertEqual(termios.tcgetattr(self.tty.fileno()), attributes)
+
+
+    def test_cbreak_restores_on_error(self):
+        attributes = termios.tcgetattr(self.tty.fileno())
+        with self.assertRaises(KeyboardInterrupt):
+            with terminal.cbreak(self.tty.fileno()):
+                self.assertFalse(termios.tcgetattr(self.tty.fileno())[3] & termios.ICANON)
+                raise KeyboardInterrupt
+        self.assertEqual(termios.tcgetattr(self.tty.fileno()), attributes)
+
+
+    def test_is_terminal_cached(self):
+        stream = io.StringIO()
+        calls = []
+        stream.isatty = lambda: calls.append(None) or True
+        self.assertTrue(terminal.is_terminal(stream))
+        self.assertTrue(terminal.is_terminal(stream))
+        self.assertEqual(len(calls), 1)
+        self.assertFalse(terminal.is_terminal(io.StringIO()))
+
+
+    def test_wait_for_key(self):
+        os.write(self.master, b'xyq')
+        self.assertEqual(terminal.wait_for_key({'q', 'z'}, self.tty), 'q')
+        self.assertEqual(terminal.read_key(io.StringIO('k')), 'k')
+        with self.assertRaises(EOFError):
+            terminal.wait_for_key({'q'}, io.StringIO('ab'))
+
+
+    def test_key_timeouts(self):
+        self.assertIsNone(terminal.read_key(self.tty, timeout=0.01))
+        os.write(self.master, b'xy')
+        self.assertIsNone(terminal.wait_for_key({'q'}, self.tty, timeout=0.05))
+        with patch('sys.stdin', self.tty), patch('sys.stdout', new_callable=io.StringIO):
+            with self.assertRaises(TimeoutError):
+                iinput.wait_for_key_press('q', timeout=0.01)
+            os.write(self.master, b'k')
+            self.assertEqual(iinput.wait_for_some_key_press(['k'], timeout=1), 'k')
+
+
+    def test_tty_source_timeout(self):
+        source = TTYSource()
+        with patch('sys.stdin', self.tty), patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            with self.assertRaises(PromptTimeout):
+                source.readline('name: ', 0.01)
+            with self.assertRaises(PromptTimeout):
+                source.getpass('secret: ', 0.01)
+            os.write(self.master, b'hunter2\n')
+            self.assertEqual(source.getpass('secret: ', 1), 'hunter2')
+        self.assertEqual(stdout.getvalue(), 'name: \nsecret: \nsecret: \n')
+
+
+    def test_iinput_key_waits(self):
+        with patch('sys.stdin', self.tty), patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            os.write(self.master, b'x')
+            iinput.wait_for_any_key_press(prompt='go "$(echo)"')
+            os.write(self.master, b'abc')
+            iinput.wait_for_key_press('c')
+            os.write(self.master, b'12')
+            iinput.wait_for_some_key_press(['2', '3'])
+        self.assertTrue(stdout.getvalue().startswith('go "$(echo)"'))
+
+
+if __name__ == '__main__':
+    unittest.main()
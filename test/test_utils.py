@@ -1,5 +1,9 @@
 import sys; sys.path.append('..');
+import io
+import array
+import tempfile
 import unittest
+from unittest.mock import patch
 
 from iinput import utils
 
@@ -73,6 +77,33 @@ class UtilsTest(unittest.TestCase):
             self.assertEqual(utils.interpret_type(string), expected_type)
 
 
+    def test_classify(self):
+        test_data = {
+            " True ": (bool, True),
+            "false": (bool, False),
+            "123": (int, 123),
+            "-123": (int, -123),
+            "+1": (int, 1),
+            "123.4": (float, 123.4),
+            "-.5": (float, -0.5),
+            "1e5": (float, 1e5),
+            "-1.5E-3": (float, -1.5e-3),
+            "abc": (str, "abc"),
+            " a b ": (str, "a b"),
+            "\u00b2": (str, "\u00b2"),
+            "\u0661\u0662": (str, "\u0661\u0662"),
+            "--1": (str, "--1"),
+            "1_000": (str, "1_000"),
+            "inf": (str, "inf"),
+            "-nan": (str, "-nan"),
+            "None": (None, None),
+            '  ': (None, None),
+            '': (None, None),
+        }
+        for string, expected in test_data.items():
+            self.assertEqual(utils.classify(string), expected)
+
+
     def test_auto_cast(self):
         test_data = [
             (['abc', '123', '123.4', 'False', 'True'], [str], ['abc', '123', '123.4', 'False', 'True']),
@@ -87,6 +118,8 @@ class UtilsTest(unittest.TestCase):
             (['0', '1'], [int, bool], [0, 1]),
             (['0', '1', '2'], [bool], [False, True, None]),
             (['0', '1', '2'], [int, bool], [0, 1, 2]),
+            (['1e5', '\u00b2', 'None', ''], [int, float], [1e5, None, None, None]),
+            (['\u00b2', 'None', ''], [str], ['\u00b2', 'None', None]),
             ([], [str, int, float, bool], []),
             ([], [], []),
         ]
@@ -94,6 +127,15 @@ class UtilsTest(unittest.TestCase):
             self.assertEqual(utils.auto_cast(items, allowed_types=allowed_types), expected_values)
 
 
+    def test_compare_values(self):
+        targets = utils.target_set([1, 1, 2])
+        self.assertEqual(utils.compare_values(targets, ['1', '2', '1']), ([], []))
+        self.assertEqual(utils.compare_values(targets, ['1', '3', '3']), (['1', '2'], ['3', '3']))
+        targets = utils.target_set([1, 1, 2], multiset=False)
+        self.assertEqual(utils.compare_values(targets, ['2', '1', '1', '1']), ([], []))
+        self.assertEqual(utils.compare_values(targets, ['1', '3']), (['2'], ['3']))
+
+
     def test_split_ws(self):
         test_data = {
             '': [],
@@ -107,6 +149,98 @@ class UtilsTest(unittest.TestCase):
         }
         for string, split in test_data.items():
             self.assertEqual(utils.split_ws(string, delimiter=','), split)
+            self.assertEqual(list(utils.iter_split_ws(string, delimiter=',')), split)
+
+        self.assertEqual(list(utils.iter_split_ws(' a :: b ::::c', delimiter='::')), ['a', 'b', 'c'])
+        with self.assertRaises(ValueError):
+            next(utils.iter_split_ws('a', delimiter=''))
+
+
+    def test_iter_cast(self):
+        items = iter(['1', ' x ', '2.5', 'true'])
+        casted = utils.iter_cast(items, allowed_types=[int, float, bool])
+        self.assertEqual(next(casted), 1)
+        self.assertEqual(list(items), [' x ', '2.5', 'true'])
+        self.assertEqual(list(utils.iter_cast(['1', ' x ', '2.5', 'true'], [int, str])), [1, 'x', '2.5', 'true'])
+
+
+
+    def test_bulk_cast(self):
+        test_data = [
+            (' 1, -2 ,+3 ', ',', [int], [1, -2, 3], 'q'),
+            ('1.5,2,3e2', ',', [int, float], [1.5, 2.0, 300.0], 'd'),
+            ('1.5  2.5e1 .5', ' ', [float], [1.5, 25.0, 0.5], 'd'),
+            ('9007199254740993 1', ' ', [int, float], [9007199254740993, 1], 'q'),
+            ('1,2', ',', [str, int, float, bool], [1, 2], 'q'),
+            ('1.,-2', ',', [int, float], [1.0, -2.0], 'd'),
+        ]
+        for string, delimiter, allowed_types, expected_values, typecode in test_data:
+            with patch('iinput.utils._numpy', return_value=None):
+                values = utils.bulk_cast(string, delimiter, allowed_types)
+                self.assertIsInstance(values, array.array)
+                self.assertEqual(values.typecode, typecode)
+                self.assertEqual(values.tolist(), expected_values)
+            if utils._numpy() is not None:
+                self.assertEqual(utils.bulk_cast(string, delimiter, allowed_types).tolist(), expected_values)
+
+        for string, delimiter, allowed_types in [
+            ('1,2', ',', [str]),
+            ('0,1', ',', [bool]),
+            ('1,a', ',', [int, str]),
+            ('1,2.5', ',', [float]),
+            ('1,2.5', ',', [int]),
+            ('1e5', ',', [int]),
+            ('inf,1.0', ',', [float]),
+            ('0x10', ',', [int]),
+            ('\u00b2', ',', [int]),
+            ('9' * 30, ',', [int]),
+            (' ', ',', [int]),
+            ('1.5 2.5e1\t.5', ' ', [float]),
+            ('1 2', '\t', [int]),
+            ('1\t2', '\t', [int]),
+            ('9007199254740993, 1.5', ',', [int, float]),
+            ('1,-', ',', [int]),
+            ('-,1', ',', [int, float]),
+            ('1, - ,2', ',', [int]),
+            ('1 + 2', ' ', [int]),
+            ('1,- 2', ',', [int]),
+            ('1 2 -', ' ', [int, float]),
+            ('1.5,.,2', ',', [float]),
+            ('1e400,1', ',', [int, float]),
+        ]:
+            self.assertIsNone(utils.bulk_cast(string, delimiter, allowed_types))
+            with patch('iinput.utils._numpy', return_value=None):
+                self.assertIsNone(utils.bulk_cast(string, delimiter, allowed_types))
+
+
+    def test_iter_chunked_lines(self):
+        text = 'a\n b \n\nlast'
+        for chunk_size in [1, 3, 1 << 16]:
+            self.assertEqual(list(utils.iter_chunked_lines(io.StringIO(text), chunk_size)), ['a', ' b ', '', 'last'])
+        self.assertEqual(list(utils.iter_chunked_lines(io.StringIO(text), max_lines=1)), ['a'])
+        self.assertEqual(list(utils.iter_chunked_lines(io.StringIO(text), max_chars=6)), ['a', ' b '])
+        for chunk_size in [1, 2, 1 << 16]:
+            self.assertEqual(list(utils.iter_chunked_lines(io.StringIO('a\nbb\n'), chunk_size, max_chars=3)), ['a'])
+            self.assertEqual(list(utils.iter_chunked_lines(io.StringIO('a\nbb\n'), chunk_size, max_chars=5)), ['a', 'bb'])
+        self.assertEqual(list(utils.iter_chunked_lines(io.StringIO(''))), [])
+
+        # a terminal reports EOF once: a short read must end the stream without reading again
+        terminal = io.StringIO('a\nb\n')
+        terminal.read = lambda size, reads=iter(['a\nb\n']): next(reads)
+        self.assertEqual(list(utils.iter_chunked_lines(terminal)), ['a', 'b'])
+
+
+    def test_iter_chunked_lines_mmap(self):
+        with tempfile.TemporaryFile() as f:
+            f.write('skip\nä\r\nb\n'.encode('utf-8'))
+            f.seek(0)
+            stream = io.TextIOWrapper(f, encoding='utf-8')
+            stream.readline()
+            for chunk_size in [1, 4, 1 << 16]:
+                stream.seek(5)
+                self.assertEqual(list(utils.iter_chunked_lines(stream, chunk_size)), ['ä', 'b'])
+            self.assertEqual(stream.read(), '')
+            stream.detach()
 
 
 if __name__ == '__main__':